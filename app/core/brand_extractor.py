@@ -1,3 +1,6 @@
+import re
+from functools import lru_cache
+import numpy as np
 from PIL import Image
 from typing import Dict, List, Tuple, Optional
 from app.utils.palette_utils import (
@@ -7,6 +10,61 @@ from app.utils.palette_utils import (
 )
 
 
+@lru_cache(maxsize=128)
+def _get_palette_info_cached(colors: Tuple[Tuple[int, int, int], ...]) -> Dict:
+    """Memoized palette analysis keyed on the (hashable) color tuple."""
+    return get_brand_palette_info(list(colors))
+
+
+def _prep_for_palette(image: Image.Image) -> Image.Image:
+    """
+    Downsample an image before palette extraction.
+
+    Dominant-color analysis does not need full resolution; capping the
+    longest side at 256px keeps the pixel count under ~65k regardless
+    of the uploaded size.
+    """
+    image = image.copy()
+    image.thumbnail((256, 256), Image.Resampling.BILINEAR)
+    return image.convert("RGB")
+
+
+# Category style lookup, built once at import time. The compiled
+# alternation lets a single regex scan replace the per-call loop of
+# substring checks.
+_CATEGORY_STYLES = {
+    "beverage": "refreshing, vibrant, lifestyle-focused, showing consumption moments",
+    "skincare": "clean, elegant, natural lighting, beauty-focused, aspirational",
+    "fashion": "stylish, trendy, lifestyle, model-focused, aspirational",
+    "food": "appetizing, colorful, close-up, lifestyle, mouth-watering",
+    "technology": "modern, sleek, futuristic, clean, professional",
+    "fitness": "energetic, active, motivational, lifestyle, dynamic",
+    "home": "cozy, comfortable, lifestyle, aspirational, warm",
+    "automotive": "powerful, sleek, dynamic, aspirational, premium"
+}
+
+_CATEGORY_RE = re.compile("|".join(map(re.escape, _CATEGORY_STYLES)))
+
+_DEFAULT_CATEGORY_STYLE = "professional, high-quality, lifestyle-focused, aspirational"
+
+# Immutable guidance shared by every extraction run
+_LOGO_PLACEMENT_INSTRUCTION = (
+    "Place the brand logo in the top-right corner, "
+    "clearly visible but not overwhelming the composition. "
+    "Ensure the logo is crisp and maintains brand identity."
+)
+
+_BRAND_SAFETY_GUIDELINES = (
+    "Avoid controversial or sensitive topics",
+    "Maintain positive and inclusive messaging",
+    "No misleading or false claims",
+    "Respect cultural sensitivities",
+    "Use appropriate and professional language",
+    "Avoid stereotypes and biases",
+    "Ensure family-friendly content"
+)
+
+
 class BrandExtractor:
     """Extractor for brand intelligence from logos and product images."""
     
@@ -42,24 +100,26 @@ class BrandExtractor:
         
         # Extract colors from logo
         if logo_image:
-            logo_colors = extract_dominant_colors(logo_image, num_colors=5)
-            logo_palette = get_brand_palette_info(logo_colors)
+            logo_colors = extract_dominant_colors(_prep_for_palette(logo_image), num_colors=5)
+            logo_palette = _get_palette_info_cached(tuple(logo_colors))
             brand_info["logo_colors"] = logo_palette
             brand_info["primary_color"] = logo_palette["primary_hex"]
-        
+
         # Extract colors from product
         if product_image:
-            product_colors = extract_dominant_colors(product_image, num_colors=5)
-            product_palette = get_brand_palette_info(product_colors)
+            product_colors = extract_dominant_colors(_prep_for_palette(product_image), num_colors=5)
+            product_palette = _get_palette_info_cached(tuple(product_colors))
             brand_info["product_colors"] = product_palette
         
         # Determine overall brand palette
         if logo_image and product_image:
-            # Combine both palettes
-            combined_colors = list(set(
-                logo_colors[:3] + product_colors[:3]
-            ))[:5]
-            brand_palette = get_brand_palette_info(combined_colors)
+            # Combine both palettes, deduplicating in C while keeping the
+            # logo-first ordering so the primary color stays stable
+            stacked = np.vstack([logo_colors[:3], product_colors[:3]])
+            _, first_idx = np.unique(stacked, axis=0, return_index=True)
+            combined = stacked[np.sort(first_idx)][:5]
+            combined_colors = [tuple(int(c) for c in row) for row in combined]
+            brand_palette = _get_palette_info_cached(tuple(combined_colors))
         elif logo_image:
             brand_palette = logo_palette
         elif product_image:
@@ -86,29 +146,27 @@ class BrandExtractor:
         Returns:
             Brand prompt segment
         """
-        prompt = f"Brand: {brand_info['brand_name']}. "
-        prompt += f"Product category: {brand_info['product_category']}. "
-        
+        parts = [
+            f"Brand: {brand_info['brand_name']}. ",
+            f"Product category: {brand_info['product_category']}. "
+        ]
+
         # Add color information
         palette = brand_info.get("brand_palette", {})
         if palette:
-            prompt += create_color_palette_prompt(palette)
-        
+            parts.append(create_color_palette_prompt(palette))
+
         # Add style guidance
         if palette.get("is_dark_palette"):
-            prompt += "Use premium, sophisticated aesthetics. "
+            parts.append("Use premium, sophisticated aesthetics. ")
         else:
-            prompt += "Use vibrant, energetic aesthetics. "
-        
-        return prompt
+            parts.append("Use vibrant, energetic aesthetics. ")
+
+        return "".join(parts)
     
     def get_logo_placement_instruction(self) -> str:
         """Get instruction for logo placement in generated images."""
-        return (
-            "Place the brand logo in the top-right corner, "
-            "clearly visible but not overwhelming the composition. "
-            "Ensure the logo is crisp and maintains brand identity."
-        )
+        return _LOGO_PLACEMENT_INSTRUCTION
     
     def get_product_category_style(self, category: str) -> str:
         """
@@ -120,32 +178,12 @@ class BrandExtractor:
         Returns:
             Style description
         """
-        category_styles = {
-            "beverage": "refreshing, vibrant, lifestyle-focused, showing consumption moments",
-            "skincare": "clean, elegant, natural lighting, beauty-focused, aspirational",
-            "fashion": "stylish, trendy, lifestyle, model-focused, aspirational",
-            "food": "appetizing, colorful, close-up, lifestyle, mouth-watering",
-            "technology": "modern, sleek, futuristic, clean, professional",
-            "fitness": "energetic, active, motivational, lifestyle, dynamic",
-            "home": "cozy, comfortable, lifestyle, aspirational, warm",
-            "automotive": "powerful, sleek, dynamic, aspirational, premium"
-        }
-        
-        category_lower = category.lower()
-        for key, style in category_styles.items():
-            if key in category_lower:
-                return style
-        
-        return "professional, high-quality, lifestyle-focused, aspirational"
+        match = _CATEGORY_RE.search(category.lower())
+        if match:
+            return _CATEGORY_STYLES[match.group(0)]
+
+        return _DEFAULT_CATEGORY_STYLE
     
-    def get_brand_safety_guidelines(self) -> List[str]:
+    def get_brand_safety_guidelines(self) -> Tuple[str, ...]:
         """Get brand safety guidelines for content generation."""
-        return [
-            "Avoid controversial or sensitive topics",
-            "Maintain positive and inclusive messaging",
-            "No misleading or false claims",
-            "Respect cultural sensitivities",
-            "Use appropriate and professional language",
-            "Avoid stereotypes and biases",
-            "Ensure family-friendly content"
-        ]
+        return _BRAND_SAFETY_GUIDELINES
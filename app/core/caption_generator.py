@@ -1,17 +1,81 @@
+import asyncio
 import google.generativeai as genai
+import json
+import logging
 import os
+import re
 from typing import List, Dict, Optional
 
+_log = logging.getLogger(__name__)
+
+# Precompiled caption cleanup/validation patterns, built once so batch
+# pipelines do not pay recompilation or repeated string scans per caption.
+# Asterisk removal uses str.translate — one C-level pass over the buffer.
+_CAPTION_STRIP = str.maketrans("", "", "*")
+_CAPTION_PREFIX_RE = re.compile(r'^\s*caption:\s*', re.IGNORECASE)
+# No word boundaries: the baseline substring check also caught
+# derived forms like "hateful", and the validator must not loosen
+_INAPPROPRIATE_RE = re.compile(r'hate|violence|offensive', re.IGNORECASE)
+
+# Caption prompt hoisted to a module-level template; only the handful
+# of slots below change per variation, so each call is a single
+# format_map instead of rebuilding the whole block.
+_CAPTION_PROMPT_TEMPLATE = """Create a compelling advertisement caption for {brand_name} {product_category}.
+
+Context:
+- Location: {city}
+- Weather: {weather_context}
+- Theme: {theme}
+- Mood: {mood}
+- Tone: {tone}
+
+Requirements:
+1. Maximum {max_length} characters
+2. Include a strong call-to-action (CTA)
+3. Be contextually relevant to the location and weather
+4. Use {tone} tone
+5. Make it engaging and shareable
+6. Include relevant emojis (2-3 maximum)
+7. No hashtags
+8. Brand-safe and positive messaging
+9. Avoid making false claims
+10. Make it feel personal and relatable
+
+Generate only the caption text, nothing else."""
+
 
 class CaptionGenerator:
     """Generator for creating brand-aligned, context-aware captions."""
-    
+
+    # One GenerativeModel per API key, shared across instances so that
+    # per-request construction (e.g. inside a web handler) does not
+    # re-run client setup every time.
+    _model_cache: Dict[str, genai.GenerativeModel] = {}
+
+    # Template-based fallback captions, formatted on demand
+    _FALLBACK_TEMPLATES = (
+        "✨ Experience {brand_name} like never before! Perfect for {city}'s {theme}. Get yours today! 🎯",
+        "🌟 {brand_name} brings you the perfect {product_category} for every moment in {city}. Try it now! 💫",
+        "💎 Elevate your {theme} with {brand_name}. Made for {city}, made for you. Shop now! 🛍️",
+        "🎨 {brand_name}: Where quality meets {theme}. Available now in {city}! ✨",
+        "⚡ Transform your day with {brand_name}. The perfect {product_category} for {city}. Order today! 🚀",
+        "🌈 Discover the {brand_name} difference. Crafted for {city}'s {theme}. Get it now! 💝",
+        "🔥 {brand_name} - Your perfect companion for {city}'s {theme}. Don't miss out! 🎁",
+        "💫 Make every moment special with {brand_name}. Now in {city}! Shop today! ✨",
+        "🎯 {brand_name}: Premium {product_category} for {city}'s vibrant {theme}. Try it now! 🌟",
+        "✨ Embrace the {brand_name} experience. Perfect for {city}, perfect for you! 🎊"
+    )
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize caption generator with Gemini API."""
         self.api_key = api_key or os.getenv("TEXT_API_KEY")
         if self.api_key and self.api_key != "your_gemini_api_key_here":
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            model = self._model_cache.get(self.api_key)
+            if model is None:
+                genai.configure(api_key=self.api_key)
+                model = genai.GenerativeModel('gemini-2.5-flash')
+                self._model_cache[self.api_key] = model
+            self.model = model
         else:
             self.model = None
     
@@ -51,8 +115,8 @@ class CaptionGenerator:
             
             return caption
             
-        except Exception as e:
-            print(f"Gemini caption generation error: {e}")
+        except Exception:
+            _log.exception("Gemini caption generation error")
             return self._generate_fallback_caption(brand_info, context)
     
     def generate_multiple_captions(
@@ -74,42 +138,184 @@ class CaptionGenerator:
         Returns:
             List of generated captions
         """
+        if self.model and len(context_variations) > 1:
+            # One batched call replaces N round-trips; fall through to
+            # per-item generation if the batched response is unusable.
+            captions = self._generate_batched_captions(
+                brand_info, context_variations, tone, max_length
+            )
+            if captions is not None:
+                return captions
+
+            try:
+                # The batched call above already failed; go straight to
+                # the per-item fan-out instead of retrying it
+                return asyncio.run(self.generate_multiple_captions_async(
+                    brand_info, context_variations, tone, max_length,
+                    try_batched=False
+                ))
+            except RuntimeError:
+                # Already inside a running event loop; fall back to
+                # sequential generation below.
+                pass
+
         captions = []
+        total = len(context_variations)
         for idx, context in enumerate(context_variations):
-            print(f"Generating caption {idx + 1}/{len(context_variations)}...")
+            _log.debug("Generating caption %d/%d...", idx + 1, total)
             caption = self.generate_caption(brand_info, context, tone, max_length)
             captions.append(caption)
-        
+
         return captions
-    
-    def _create_caption_prompt(
+
+    async def generate_multiple_captions_async(
         self,
         brand_info: Dict,
-        context: Dict,
+        context_variations: List[Dict],
+        tone: str = "engaging",
+        max_length: int = 150,
+        concurrency: int = 20,
+        try_batched: bool = True
+    ) -> List[str]:
+        """
+        Generate captions for all variations concurrently.
+
+        Fans requests out with asyncio.gather so wall-time is bounded by
+        the slowest call instead of the sum of all calls. Concurrency is
+        capped with a semaphore to respect API rate limits.
+
+        Args:
+            brand_info: Brand information dictionary
+            context_variations: List of context variations
+            tone: Caption tone
+            max_length: Maximum caption length
+            concurrency: Maximum number of in-flight API calls
+            try_batched: Whether bulk runs may use the single batched
+                call; callers that already tried it pass False
+
+        Returns:
+            List of generated captions
+        """
+        if not self.model:
+            return [
+                self._generate_fallback_caption(brand_info, context)
+                for context in context_variations
+            ]
+
+        # Bulk runs are not latency-critical: one batched call is far
+        # cheaper than N round-trips. Small runs stay on the per-item
+        # path, which responds faster for interactive use.
+        if try_batched and len(context_variations) > 3:
+            captions = await asyncio.to_thread(
+                self._generate_batched_captions,
+                brand_info, context_variations, tone, max_length
+            )
+            if captions is not None:
+                return captions
+
+        semaphore = asyncio.Semaphore(concurrency)
+        prompts = [
+            self._create_caption_prompt(brand_info, context, tone, max_length)
+            for context in context_variations
+        ]
+        results = await asyncio.gather(
+            *(self._agenerate_one(prompt, semaphore) for prompt in prompts),
+            return_exceptions=True
+        )
+
+        captions = []
+        for context, result in zip(context_variations, results):
+            if isinstance(result, Exception):
+                _log.error("Gemini caption generation error: %s", result)
+                captions.append(self._generate_fallback_caption(brand_info, context))
+                continue
+
+            caption = self._clean_caption(result)
+            if len(caption) > max_length:
+                caption = caption[:max_length-3] + "..."
+            captions.append(caption)
+
+        return captions
+
+    def _generate_batched_captions(
+        self,
+        brand_info: Dict,
+        context_variations: List[Dict],
+        tone: str,
+        max_length: int
+    ) -> Optional[List[str]]:
+        """
+        Generate all captions in a single Gemini call.
+
+        Asks for a JSON array of exactly one caption per variation,
+        cutting API overhead from N round-trips to one.
+
+        Returns:
+            List of captions, or None if the call or parsing fails
+        """
+        try:
+            prompt = self._create_batched_caption_prompt(
+                brand_info, context_variations, tone, max_length
+            )
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    }
+                }
+            )
+            captions = json.loads(response.text)
+
+            if not isinstance(captions, list) or len(captions) != len(context_variations):
+                return None
+
+            cleaned = []
+            for caption in captions:
+                caption = self._clean_caption(str(caption))
+                if len(caption) > max_length:
+                    caption = caption[:max_length-3] + "..."
+                cleaned.append(caption)
+
+            return cleaned
+
+        except Exception:
+            _log.exception("Batched caption generation error")
+            return None
+
+    def _create_batched_caption_prompt(
+        self,
+        brand_info: Dict,
+        context_variations: List[Dict],
         tone: str,
         max_length: int
     ) -> str:
-        """Create a prompt for caption generation."""
+        """Create a single prompt covering every context variation."""
         brand_name = brand_info.get("brand_name", "Brand")
         product_category = brand_info.get("product_category", "product")
-        city = context.get("city", "")
-        weather_context = context.get("weather_context", "")
-        mood = context.get("mood", "")
-        theme = context.get("theme", "")
-        
-        prompt = f"""Create a compelling advertisement caption for {brand_name} {product_category}.
 
-Context:
-- Location: {city}
-- Weather: {weather_context}
-- Theme: {theme}
-- Mood: {mood}
-- Tone: {tone}
+        variation_lines = []
+        for idx, context in enumerate(context_variations):
+            variation_lines.append(
+                f"Variation {idx + 1}: "
+                f"city={context.get('city', '')}, "
+                f"weather={context.get('weather_context', '')}, "
+                f"theme={context.get('theme', '')}, "
+                f"mood={context.get('mood', '')}"
+            )
 
-Requirements:
+        variations_block = "\n".join(variation_lines)
+
+        prompt = f"""Create {len(context_variations)} compelling advertisement captions for {brand_name} {product_category}, one per variation below.
+
+{variations_block}
+
+Requirements for every caption:
 1. Maximum {max_length} characters
 2. Include a strong call-to-action (CTA)
-3. Be contextually relevant to the location and weather
+3. Be contextually relevant to the variation's location and weather
 4. Use {tone} tone
 5. Make it engaging and shareable
 6. Include relevant emojis (2-3 maximum)
@@ -118,9 +324,34 @@ Requirements:
 9. Avoid making false claims
 10. Make it feel personal and relatable
 
-Generate only the caption text, nothing else."""
-        
+Return exactly {len(context_variations)} captions as a JSON array of strings, one per variation, in order."""
+
         return prompt
+
+    async def _agenerate_one(self, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        """Generate a single caption through the async Gemini client."""
+        async with semaphore:
+            response = await self.model.generate_content_async(prompt)
+            return response.text.strip()
+    
+    def _create_caption_prompt(
+        self,
+        brand_info: Dict,
+        context: Dict,
+        tone: str,
+        max_length: int
+    ) -> str:
+        """Create a prompt for caption generation."""
+        return _CAPTION_PROMPT_TEMPLATE.format_map({
+            "brand_name": brand_info.get("brand_name", "Brand"),
+            "product_category": brand_info.get("product_category", "product"),
+            "city": context.get("city", ""),
+            "weather_context": context.get("weather_context", ""),
+            "theme": context.get("theme", ""),
+            "mood": context.get("mood", ""),
+            "tone": tone,
+            "max_length": max_length
+        })
     
     def _generate_fallback_caption(self, brand_info: Dict, context: Dict) -> str:
         """Generate a fallback caption when API is unavailable."""
@@ -128,40 +359,26 @@ Generate only the caption text, nothing else."""
         product_category = brand_info.get("product_category", "product")
         city = context.get("city", "your city")
         theme = context.get("theme", "lifestyle")
-        
-        # Template-based captions
-        templates = [
-            f"✨ Experience {brand_name} like never before! Perfect for {city}'s {theme}. Get yours today! 🎯",
-            f"🌟 {brand_name} brings you the perfect {product_category} for every moment in {city}. Try it now! 💫",
-            f"💎 Elevate your {theme} with {brand_name}. Made for {city}, made for you. Shop now! 🛍️",
-            f"🎨 {brand_name}: Where quality meets {theme}. Available now in {city}! ✨",
-            f"⚡ Transform your day with {brand_name}. The perfect {product_category} for {city}. Order today! 🚀",
-            f"🌈 Discover the {brand_name} difference. Crafted for {city}'s {theme}. Get it now! 💝",
-            f"🔥 {brand_name} - Your perfect companion for {city}'s {theme}. Don't miss out! 🎁",
-            f"💫 Make every moment special with {brand_name}. Now in {city}! Shop today! ✨",
-            f"🎯 {brand_name}: Premium {product_category} for {city}'s vibrant {theme}. Try it now! 🌟",
-            f"✨ Embrace the {brand_name} experience. Perfect for {city}, perfect for you! 🎊"
-        ]
-        
+
         # Use variation_id to select template if available
         variation_id = context.get("variation_id", 1)
-        template_idx = (variation_id - 1) % len(templates)
-        
-        return templates[template_idx]
+        template_idx = (variation_id - 1) % len(self._FALLBACK_TEMPLATES)
+
+        return self._FALLBACK_TEMPLATES[template_idx].format(
+            brand_name=brand_name,
+            product_category=product_category,
+            city=city,
+            theme=theme
+        )
     
     def _clean_caption(self, caption: str) -> str:
         """Clean and format caption."""
-        # Remove quotes if present
-        caption = caption.strip('"').strip("'")
-        
-        # Remove any markdown formatting
-        caption = caption.replace("**", "").replace("*", "")
-        
-        # Ensure it doesn't start with "Caption:"
-        if caption.lower().startswith("caption:"):
-            caption = caption[8:].strip()
-        
-        return caption
+        # Drop markdown asterisks in one translate pass, then strip
+        # surrounding quotes and any "Caption:" prefix
+        caption = caption.translate(_CAPTION_STRIP).strip().strip('"\'')
+        caption = _CAPTION_PREFIX_RE.sub("", caption)
+
+        return caption.strip()
     
     def validate_caption(self, caption: str) -> bool:
         """
@@ -178,11 +395,4 @@ Generate only the caption text, nothing else."""
             return False
         
         # Check for inappropriate content (basic check)
-        inappropriate_words = ["hate", "violence", "offensive"]
-        caption_lower = caption.lower()
-        
-        for word in inappropriate_words:
-            if word in caption_lower:
-                return False
-        
-        return True
+        return _INAPPROPRIATE_RE.search(caption) is None
@@ -1,11 +1,81 @@
+import time
 from typing import Dict, List, Optional
 from datetime import datetime
 from app.services.weather_service import WeatherService
 
+# Second-resolution timestamp cache: request timestamps do not need
+# sub-second precision, so reuse the formatted string within a second.
+_ts_cache = {"sec": 0, "iso": ""}
+
+
+def _current_timestamp() -> str:
+    """Return an ISO timestamp, cached at second resolution."""
+    now_s = int(time.time())
+    if now_s != _ts_cache["sec"]:
+        _ts_cache["sec"] = now_s
+        _ts_cache["iso"] = datetime.fromtimestamp(now_s).isoformat()
+    return _ts_cache["iso"]
+
+
+# Static lookup tables, built once at import time instead of on every
+# request.
+_POI_DATA = {
+    "Bangalore": ["cafes", "tech parks", "gardens", "breweries", "malls"],
+    "Chennai": ["beaches", "temples", "marina", "shopping districts"],
+    "Mumbai": ["marine drive", "malls", "beaches", "street markets"],
+    "Delhi": ["monuments", "markets", "malls", "restaurants", "historical sites"],
+    "Hyderabad": ["tech hubs", "biryani spots", "lakes", "monuments"],
+    "Pune": ["colleges", "cafes", "hills", "restaurants"],
+    "Kolkata": ["cultural centers", "markets", "sweets shops", "heritage sites"]
+}
+
+_FESTIVALS = {
+    "winter": ["Christmas", "New Year", "Pongal", "Makar Sankranti"],
+    "spring": ["Holi", "Ugadi", "Gudi Padwa"],
+    "monsoon": ["Raksha Bandhan", "Independence Day", "Onam"],
+    "autumn": ["Diwali", "Durga Puja", "Dussehra", "Navratri"]
+}
+
+_CITY_CULTURE = {
+    "Bangalore": "tech-savvy, café culture, cosmopolitan vibes",
+    "Chennai": "traditional, coastal culture, filter coffee culture",
+    "Mumbai": "fast-paced, bollywood, street food culture",
+    "Delhi": "historical, diverse cuisine, shopping culture",
+    "Hyderabad": "biryani culture, tech hub, historical heritage",
+    "Pune": "educational hub, young crowd, café culture",
+    "Kolkata": "artistic, literary, sweet culture, cultural festivals"
+}
+
+_CITY_VIBES = {
+    "Bangalore": "Bangalore monsoon vibes, tech-savvy millennials, café hoppers",
+    "Chennai": "Chennai coastal vibes, traditional yet modern, beach lovers",
+    "Mumbai": "Mumbai hustle, bollywood dreams, street food enthusiasts",
+    "Delhi": "Delhi nightlife, historical charm, food explorers",
+    "Hyderabad": "Hyderabad heritage, biryani lovers, tech professionals",
+    "Pune": "Pune student life, young energy, weekend adventurers",
+    "Kolkata": "Kolkata artistic soul, cultural enthusiasts, sweet lovers"
+}
+
 
 class ContextEngine:
     """Engine for gathering and enriching context data."""
-    
+
+    # Variation themes paired with their moods, applied cyclically.
+    # "weather-specific" is the one theme whose mood depends on the
+    # base context and is formatted at variation time.
+    _THEME_MOODS = (
+        ("morning energy", "energetic, fresh start, morning routine"),
+        ("afternoon relaxation", "relaxed, leisure time, comfort"),
+        ("evening social", "social, gathering, celebration"),
+        ("weekend vibes", "fun, adventure, exploration"),
+        ("festive celebration", "festive, joyful, celebration"),
+        ("local culture", "cultural, traditional, local pride"),
+        ("weather-specific", "weather-aware, {description}"),
+        ("POI-focused", "location-specific, local hotspots"),
+        ("lifestyle", "lifestyle-focused, aspirational"),
+        ("aspirational", "premium, aspirational, elevated"),
+    )
+
     def __init__(self):
         """Initialize context engine."""
         self.weather_service = WeatherService()
@@ -54,7 +124,7 @@ class ContextEngine:
             "cultural_context": cultural_context,
             "local_vibes": local_vibes,
             "product_category": product_category,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _current_timestamp()
         }
         
         if custom_context:
@@ -64,41 +134,12 @@ class ContextEngine:
     
     def _get_pois(self, city: str) -> List[str]:
         """Get points of interest for a city (mock data)."""
-        poi_data = {
-            "Bangalore": ["cafes", "tech parks", "gardens", "breweries", "malls"],
-            "Chennai": ["beaches", "temples", "marina", "shopping districts"],
-            "Mumbai": ["marine drive", "malls", "beaches", "street markets"],
-            "Delhi": ["monuments", "markets", "malls", "restaurants", "historical sites"],
-            "Hyderabad": ["tech hubs", "biryani spots", "lakes", "monuments"],
-            "Pune": ["colleges", "cafes", "hills", "restaurants"],
-            "Kolkata": ["cultural centers", "markets", "sweets shops", "heritage sites"]
-        }
-        
-        return poi_data.get(city, ["local attractions", "shopping areas", "restaurants"])
-    
+        return _POI_DATA.get(city, ["local attractions", "shopping areas", "restaurants"])
+
     def _get_cultural_context(self, city: str, season: str) -> str:
         """Get cultural context for a city and season."""
-        # Festival mapping
-        festivals = {
-            "winter": ["Christmas", "New Year", "Pongal", "Makar Sankranti"],
-            "spring": ["Holi", "Ugadi", "Gudi Padwa"],
-            "monsoon": ["Raksha Bandhan", "Independence Day", "Onam"],
-            "autumn": ["Diwali", "Durga Puja", "Dussehra", "Navratri"]
-        }
-        
-        # City-specific culture
-        city_culture = {
-            "Bangalore": "tech-savvy, café culture, cosmopolitan vibes",
-            "Chennai": "traditional, coastal culture, filter coffee culture",
-            "Mumbai": "fast-paced, bollywood, street food culture",
-            "Delhi": "historical, diverse cuisine, shopping culture",
-            "Hyderabad": "biryani culture, tech hub, historical heritage",
-            "Pune": "educational hub, young crowd, café culture",
-            "Kolkata": "artistic, literary, sweet culture, cultural festivals"
-        }
-        
-        season_festivals = festivals.get(season, [])
-        city_vibe = city_culture.get(city, "vibrant local culture")
+        season_festivals = _FESTIVALS.get(season, [])
+        city_vibe = _CITY_CULTURE.get(city, "vibrant local culture")
         
         context = f"{city} culture: {city_vibe}. "
         if season_festivals:
@@ -108,17 +149,7 @@ class ContextEngine:
     
     def _get_local_vibes(self, city: str) -> str:
         """Get local vibes and mood for a city."""
-        vibes = {
-            "Bangalore": "Bangalore monsoon vibes, tech-savvy millennials, café hoppers",
-            "Chennai": "Chennai coastal vibes, traditional yet modern, beach lovers",
-            "Mumbai": "Mumbai hustle, bollywood dreams, street food enthusiasts",
-            "Delhi": "Delhi nightlife, historical charm, food explorers",
-            "Hyderabad": "Hyderabad heritage, biryani lovers, tech professionals",
-            "Pune": "Pune student life, young energy, weekend adventurers",
-            "Kolkata": "Kolkata artistic soul, cultural enthusiasts, sweet lovers"
-        }
-        
-        return vibes.get(city, f"{city} local vibes and culture")
+        return _CITY_VIBES.get(city, f"{city} local vibes and culture")
     
     def create_context_variations(self, base_context: Dict, num_variations: int = 10) -> List[Dict]:
         """
@@ -131,49 +162,17 @@ class ContextEngine:
         Returns:
             List of context variations
         """
+        theme_moods = self._THEME_MOODS
+        description = base_context.get("weather", {}).get("description", "")
+
         variations = []
-        
-        # Variation themes
-        themes = [
-            "morning energy",
-            "afternoon relaxation",
-            "evening social",
-            "weekend vibes",
-            "festive celebration",
-            "local culture",
-            "weather-specific",
-            "POI-focused",
-            "lifestyle",
-            "aspirational"
-        ]
-        
         for i in range(num_variations):
-            variation = base_context.copy()
-            variation["theme"] = themes[i % len(themes)]
-            variation["variation_id"] = i + 1
-            
-            # Add theme-specific context
-            if variation["theme"] == "morning energy":
-                variation["mood"] = "energetic, fresh start, morning routine"
-            elif variation["theme"] == "afternoon relaxation":
-                variation["mood"] = "relaxed, leisure time, comfort"
-            elif variation["theme"] == "evening social":
-                variation["mood"] = "social, gathering, celebration"
-            elif variation["theme"] == "weekend vibes":
-                variation["mood"] = "fun, adventure, exploration"
-            elif variation["theme"] == "festive celebration":
-                variation["mood"] = "festive, joyful, celebration"
-            elif variation["theme"] == "local culture":
-                variation["mood"] = "cultural, traditional, local pride"
-            elif variation["theme"] == "weather-specific":
-                variation["mood"] = f"weather-aware, {base_context['weather']['description']}"
-            elif variation["theme"] == "POI-focused":
-                variation["mood"] = "location-specific, local hotspots"
-            elif variation["theme"] == "lifestyle":
-                variation["mood"] = "lifestyle-focused, aspirational"
-            else:  # aspirational
-                variation["mood"] = "premium, aspirational, elevated"
-            
-            variations.append(variation)
-        
+            theme, mood = theme_moods[i % len(theme_moods)]
+            variations.append({
+                **base_context,
+                "theme": theme,
+                "mood": mood.format(description=description) if theme == "weather-specific" else mood,
+                "variation_id": i + 1
+            })
+
         return variations
@@ -1,6 +1,31 @@
 
+from functools import lru_cache
 from typing import Dict, List
 
+# Category → base style phrase, scanned once per (cached) lookup
+_CATEGORY_BASE = {
+    "beverage": "refreshing drink visual",
+    "skincare": "clean, minimal beauty style",
+    "beauty": "clean, minimal beauty style",
+    "food": "appetizing, simple food visual",
+    "tech": "modern, minimal tech style"
+}
+
+# Negative prompt is constant; join it once at import time
+_NEGATIVE_PROMPT = ", ".join((
+    "low quality",
+    "blurry",
+    "pixelated",
+    "distorted",
+    "ugly",
+    "bad composition",
+    "watermark",
+    "text overlay",
+    "logo overlay",
+    "amateur",
+    "unprofessional"
+))
+
 
 class PromptBuilder:
     """Builder for creating adaptive prompts for image generation."""
@@ -33,8 +58,14 @@ class PromptBuilder:
             if hex_colors:
                 primary_color = hex_colors[0]
 
-        # Short style phrase based on category / context
-        style_phrase = self._get_style_modifiers(brand_info, context)
+        # Short style phrase based on category / context. Across N
+        # variations these inputs rarely change, so the lookup is cached
+        # on a compact primitive key.
+        style_phrase = self._get_style_modifiers(
+            (brand_info.get("product_category") or "").lower(),
+            context.get("weather", {}).get("main", ""),
+            context.get("time_of_day", "")
+        )
 
         # Core prompt: keep it to 1–2 sentences, poster-focused
         parts = []
@@ -54,13 +85,12 @@ class PromptBuilder:
         if style_phrase:
             parts.append(style_phrase)
 
-        # Join everything into a compact sentence
-        prompt = ", ".join(parts)
-
-        # Light technical guidance, not a long tail
-        prompt += ". High quality, clear composition, easy-to-read poster design"
+        # Light technical guidance, not a long tail; appended before the
+        # join so the prompt is assembled in a single pass
+        parts[-1] += ". High quality, clear composition, easy-to-read poster design"
 
-        return prompt
+        # Join everything into a compact sentence
+        return ", ".join(parts)
     
     def _get_creative_type_prompt(self, creative_type: str) -> str:
         """Get base prompt for creative type."""
@@ -76,34 +106,23 @@ class PromptBuilder:
         
         return creative_types.get(creative_type, "Professional advertisement")
     
-    def _get_style_modifiers(self, brand_info: Dict, context: Dict) -> str:
+    @lru_cache(maxsize=256)
+    def _get_style_modifiers(self, product_category: str, main_weather: str, time_of_day: str) -> str:
         """Get a short style phrase based on brand and context."""
-        product_category = (brand_info.get("product_category") or "").lower()
-        weather = context.get("weather", {})
-        time_of_day = context.get("time_of_day", "")
-
         # Base by category (1 short phrase)
-        if "beverage" in product_category:
-            base = "refreshing drink visual"
-        elif "skincare" in product_category or "beauty" in product_category:
-            base = "clean, minimal beauty style"
-        elif "food" in product_category:
-            base = "appetizing, simple food visual"
-        elif "tech" in product_category:
-            base = "modern, minimal tech style"
-        else:
-            base = "simple lifestyle aesthetic"
+        base = next(
+            (phrase for key, phrase in _CATEGORY_BASE.items() if key in product_category),
+            "simple lifestyle aesthetic"
+        )
 
         # Light touch from weather / time, at most one extra phrase
         extra = None
-        if weather:
-            main_weather = weather.get("main", "")
-            if main_weather == "Rain":
-                extra = "cozy feel"
-            elif main_weather == "Clear":
-                extra = "bright feel"
-            elif main_weather == "Clouds":
-                extra = "soft light"
+        if main_weather == "Rain":
+            extra = "cozy feel"
+        elif main_weather == "Clear":
+            extra = "bright feel"
+        elif main_weather == "Clouds":
+            extra = "soft light"
 
         if not extra and time_of_day:
             if time_of_day == "morning":
@@ -151,18 +170,4 @@ class PromptBuilder:
         Returns:
             Negative prompt
         """
-        negative_elements = [
-            "low quality",
-            "blurry",
-            "pixelated",
-            "distorted",
-            "ugly",
-            "bad composition",
-            "watermark",
-            "text overlay",
-            "logo overlay",
-            "amateur",
-            "unprofessional"
-        ]
-        
-        return ", ".join(negative_elements)
+        return _NEGATIVE_PROMPT
@@ -1,8 +1,11 @@
+import asyncio
+import tempfile
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from PIL import Image
-import io
 import os
 from typing import Optional, List
 from datetime import datetime
@@ -13,17 +16,25 @@ from app.core.brand_extractor import BrandExtractor
 from app.core.prompt_builder import PromptBuilder
 from app.core.caption_generator import CaptionGenerator
 from app.services.dalle_service import DalleService
-from app.utils.image_utils import create_composite, ensure_rgb
-from app.utils.zip_utils import create_creative_package
+from app.utils.image_utils import create_composite, save_png_fast
+from app.utils.zip_utils import iter_creative_package
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled HTTP connections on shutdown."""
+    yield
+    await dalle_service.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Creative Studio API",
     description="Generate hyper-personalized, context-aware ad creatives",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -35,6 +46,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+async def _read_upload_image(upload: UploadFile) -> Image.Image:
+    """Read an upload in chunks into a spooled buffer and decode it.
+
+    Avoids materializing the whole request body as one bytes object;
+    files over 8 MB spill transparently to disk.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    while chunk := await upload.read(1024 * 1024):
+        buffer.write(chunk)
+    buffer.seek(0)
+    image = Image.open(buffer)
+    image.load()
+    buffer.close()
+    return image
+
+
+def _finalize_image(image: Image.Image, img_path: str) -> str:
+    """Convert to RGB and save in one worker-thread hop."""
+    return save_png_fast(image, img_path)
+
+
 # Initialize services
 context_engine = ContextEngine()
 brand_extractor = BrandExtractor()
@@ -96,51 +128,71 @@ async def generate_creatives(
         product_img = None
         
         if logo:
-            logo_content = await logo.read()
-            logo_img = Image.open(io.BytesIO(logo_content))
-        
+            logo_img = await _read_upload_image(logo)
+
         if product_image:
-            product_content = await product_image.read()
-            product_img = Image.open(io.BytesIO(product_content))
+            product_img = await _read_upload_image(product_image)
         
-        # Extract brand information
-        brand_info = brand_extractor.extract_brand_info(
-            logo_image=logo_img,
-            product_image=product_img,
-            brand_name=brand_name,
-            product_category=product_category
+        # Brand extraction (palette work) and context lookup are
+        # independent sync stages; run both in worker threads so they
+        # neither block the loop nor each other
+        brand_info, base_context = await asyncio.gather(
+            asyncio.to_thread(
+                brand_extractor.extract_brand_info,
+                logo_image=logo_img,
+                product_image=product_img,
+                brand_name=brand_name,
+                product_category=product_category
+            ),
+            asyncio.to_thread(
+                context_engine.get_context,
+                city=city,
+                product_category=product_category
+            )
         )
-        
-        # Get context
-        base_context = context_engine.get_context(
-            city=city,
-            product_category=product_category
-        )
-        
+
         # Create variations
-        context_variations = context_engine.create_context_variations(
+        context_variations = await asyncio.to_thread(
+            context_engine.create_context_variations,
             base_context,
             num_variations=num_creatives
         )
-        
+
         # Build prompts
-        prompts = prompt_builder.build_multiple_prompts(
+        prompts = await asyncio.to_thread(
+            prompt_builder.build_multiple_prompts,
             brand_info=brand_info,
             context_variations=context_variations
         )
         
-        # Generate images
+        # Generate images concurrently; bound the fan-out to respect
+        # OpenAI rate limits
+        semaphore = asyncio.Semaphore(8)
+
+        async def generate_bounded(prompt: str):
+            async with semaphore:
+                return await dalle_service.generate_image_async(prompt)
+
+        results = await asyncio.gather(
+            *(generate_bounded(prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+
         generated_images = []
-        for prompt in prompts:
-            image = dalle_service.generate_image(prompt)
-            if image:
-                # Add logo if provided
-                if logo_img:
-                    image = create_composite(image, logo_img)
-                generated_images.append(image)
+        for result in results:
+            if isinstance(result, Exception) or result is None:
+                continue
+            image = result
+            # Add logo if provided; compositing is blocking PIL work,
+            # so run it in a worker thread
+            if logo_img:
+                image = await asyncio.to_thread(create_composite, image, logo_img)
+            generated_images.append(image)
         
-        # Generate captions
-        captions = caption_generator.generate_multiple_captions(
+        # Generate captions; runs in a worker thread, which also lets
+        # the generator use its own event loop for the async fan-out
+        captions = await asyncio.to_thread(
+            caption_generator.generate_multiple_captions,
             brand_info=brand_info,
             context_variations=context_variations,
             tone=caption_tone.lower()
@@ -150,12 +202,16 @@ async def generate_creatives(
         output_dir = "output"
         os.makedirs(output_dir, exist_ok=True)
         
-        image_paths = []
-        for idx, img in enumerate(generated_images):
-            img_path = os.path.join(output_dir, f"creative_{idx+1:02d}.png")
-            img = ensure_rgb(img)
-            img.save(img_path)
-            image_paths.append(img_path)
+        # RGB conversion + PNG encode are CPU-bound; finalize all images
+        # in parallel across worker threads
+        image_paths = [
+            os.path.join(output_dir, f"creative_{idx+1:02d}.png")
+            for idx in range(len(generated_images))
+        ]
+        await asyncio.gather(*(
+            asyncio.to_thread(_finalize_image, img, img_path)
+            for img, img_path in zip(generated_images, image_paths)
+        ))
         
         # Create metadata
         metadata = [
@@ -166,22 +222,21 @@ async def generate_creatives(
             for idx, ctx in enumerate(context_variations)
         ]
         
-        # Create ZIP package
-        zip_path = create_creative_package(
-            output_path=output_dir,
-            images=image_paths,
-            captions=captions,
-            metadata=metadata,
-            package_name=f"{brand_name.lower().replace(' ', '_')}_creatives"
-        )
-        
-        # Return ZIP file
-        return FileResponse(
-            zip_path,
+        # Stream the ZIP straight to the client instead of assembling
+        # the whole archive on disk first
+        package_name = f"{brand_name.lower().replace(' ', '_')}_creatives"
+        return StreamingResponse(
+            iter_creative_package(
+                images=image_paths,
+                captions=captions,
+                metadata=metadata
+            ),
             media_type="application/zip",
-            filename=os.path.basename(zip_path)
+            headers={
+                "Content-Disposition": f'attachment; filename="{package_name}.zip"'
+            }
         )
-        
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -189,4 +244,13 @@ async def generate_creatives(
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # String import path is required for multi-worker mode; each worker
+    # process imports the module and builds its own service singletons
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        loop="uvloop",
+        http="httptools"
+    )
@@ -1,22 +1,180 @@
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import numpy as np
 import openai
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 import requests
 from PIL import Image
 import io
 
+# Optional semantic cache: when sentence-transformers is installed,
+# near-duplicate prompts reuse already-generated images.
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# In-process cache bound; disk cache is unbounded but content-addressed
+_MEMORY_CACHE_MAX = 32
+
+# Cosine similarity above which two prompts are treated as equivalent
+_SEMANTIC_SIM_THRESHOLD = 0.9
+
 
 class DalleService:
     """Service for generating images using DALL-E."""
-    
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize DALL-E service with API key."""
         self.api_key = api_key or os.getenv("IMAGE_API_KEY")
-        if self.api_key and self.api_key != "your_openai_api_key_here":
-            openai.api_key = self.api_key
         self.model = "dall-e-3"
         self.size = os.getenv("IMAGE_SIZE", "1024x1024")
         self.quality = os.getenv("IMAGE_QUALITY", "standard")
+        self._client = None
+        self._async_client = None
+        self._http_client = None
+        self.cache_dir = os.getenv("IMAGE_CACHE_DIR", "cache/dalle")
+        self._memory_cache: Dict[str, Image.Image] = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
+        # generate_image runs on thread pools and the async path touches
+        # the caches from to_thread workers; one lock keeps eviction and
+        # the semantic embeddings/keys pair consistent across threads
+        self._cache_lock = threading.Lock()
+        self._embedder = None
+        self._prompt_embeddings: Optional[np.ndarray] = None
+        self._prompt_cache_keys: List[str] = []
+        self._placeholder_template: Optional[Image.Image] = None
+
+    def _get_client(self) -> "openai.OpenAI":
+        """Lazily create the shared sync OpenAI client."""
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
+    def _get_async_client(self) -> "openai.AsyncOpenAI":
+        """Lazily create the shared async OpenAI client."""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key)
+        return self._async_client
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared download client (HTTP/2, pooled)."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=32)
+            )
+        return self._http_client
+
+    async def _download(self, url: str) -> bytes:
+        """Download image bytes over the pooled async client."""
+        response = await self._get_http_client().get(url)
+        response.raise_for_status()
+        return response.content
+
+    async def aclose(self) -> None:
+        """Close pooled connections; call on application shutdown."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _cache_key(self, prompt: str, size: str, quality: str, style: str) -> str:
+        """Content-address a generation request."""
+        raw = f"{self.model}|{size}|{quality}|{style}|{prompt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_lookup(self, key: str) -> Optional[Image.Image]:
+        """Return a cached image for this key, or None."""
+        image = self._memory_cache.get(key)
+        if image is None:
+            cache_path = os.path.join(self.cache_dir, f"{key}.png")
+            if os.path.exists(cache_path):
+                image = Image.open(cache_path)
+                image.load()
+                self._memory_cache_store(key, image)
+
+        if image is None:
+            self.cache_stats["misses"] += 1
+            return None
+
+        self.cache_stats["hits"] += 1
+        return image.copy()
+
+    def _cache_store(self, key: str, content: bytes, image: Image.Image) -> None:
+        """Persist generated image bytes atomically and cache in memory."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = os.path.join(self.cache_dir, f"{key}.png")
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"DALL-E cache write error: {e}")
+
+        self._memory_cache_store(key, image)
+
+    def _memory_cache_store(self, key: str, image: Image.Image) -> None:
+        # Eviction shares the cache lock: two threads at capacity could
+        # otherwise race to pop the same first key
+        with self._cache_lock:
+            if len(self._memory_cache) >= _MEMORY_CACHE_MAX:
+                self._memory_cache.pop(next(iter(self._memory_cache)), None)
+            self._memory_cache[key] = image
+
+    def _semantic_cache_get(self, prompt: str):
+        """
+        Look up a near-duplicate prompt in the semantic cache.
+
+        Returns:
+            (embedding, cached image or None). The embedding is None when
+            sentence-transformers is unavailable or encoding fails.
+        """
+        if SentenceTransformer is None:
+            return None, None
+
+        try:
+            if self._embedder is None:
+                with self._cache_lock:
+                    if self._embedder is None:
+                        self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+            embedding = self._embedder.encode(prompt, normalize_embeddings=True)
+        except Exception as e:
+            print(f"Prompt embedding error: {e}")
+            return None, None
+
+        # Snapshot keys and matrix together; _semantic_cache_add mutates
+        # both under the same lock, so the pair stays aligned
+        with self._cache_lock:
+            keys = list(self._prompt_cache_keys)
+            matrix = self._prompt_embeddings
+
+        if keys:
+            sims = matrix @ embedding
+            best = int(np.argmax(sims))
+            if float(sims[best]) >= _SEMANTIC_SIM_THRESHOLD:
+                cached = self._cache_lookup(keys[best])
+                if cached is not None:
+                    return embedding, cached
+
+        return embedding, None
+
+    def _semantic_cache_add(self, embedding: Optional[np.ndarray], key: str) -> None:
+        """Register a freshly generated prompt in the semantic cache."""
+        if embedding is None:
+            return
+        row = embedding[None, :]
+        with self._cache_lock:
+            if self._prompt_embeddings is None:
+                self._prompt_embeddings = row
+            else:
+                self._prompt_embeddings = np.vstack([self._prompt_embeddings, row])
+            self._prompt_cache_keys.append(key)
     
     def generate_image(
         self,
@@ -40,9 +198,18 @@ class DalleService:
         if not self.api_key or self.api_key == "your_openai_api_key_here":
             print("⚠️  No valid OpenAI API key found. Using placeholder image.")
             return self._create_placeholder_image(prompt)
-        
+
+        cache_key = self._cache_key(prompt, size or self.size, quality or self.quality, style)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        embedding, semantic_hit = self._semantic_cache_get(prompt)
+        if semantic_hit is not None:
+            return semantic_hit
+
         try:
-            response = openai.images.generate(
+            response = self._get_client().images.generate(
                 model=self.model,
                 prompt=prompt,
                 size=size or self.size,
@@ -50,21 +217,81 @@ class DalleService:
                 style=style,
                 n=1
             )
-            
+
             # Download the image
             image_url = response.data[0].url
             image_response = requests.get(image_url, timeout=30)
             image_response.raise_for_status()
-            
+
             # Convert to PIL Image
             image = Image.open(io.BytesIO(image_response.content))
-            
+            self._cache_store(cache_key, image_response.content, image)
+            self._semantic_cache_add(embedding, cache_key)
+
             return image
-            
+
         except Exception as e:
             print(f"DALL-E generation error: {e}")
             return self._create_placeholder_image(prompt)
     
+    async def generate_image_async(
+        self,
+        prompt: str,
+        size: Optional[str] = None,
+        quality: Optional[str] = None,
+        style: str = "vivid"
+    ) -> Optional[Image.Image]:
+        """
+        Generate a single image using DALL-E without blocking the event loop.
+
+        Args:
+            prompt: Text prompt for image generation
+            size: Image size (1024x1024, 1024x1792, or 1792x1024)
+            quality: Image quality (standard or hd)
+            style: Image style (vivid or natural)
+
+        Returns:
+            PIL Image object or None if generation fails
+        """
+        if not self.api_key or self.api_key == "your_openai_api_key_here":
+            print("⚠️  No valid OpenAI API key found. Using placeholder image.")
+            return self._create_placeholder_image(prompt)
+
+        cache_key = self._cache_key(prompt, size or self.size, quality or self.quality, style)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        embedding, semantic_hit = await asyncio.to_thread(self._semantic_cache_get, prompt)
+        if semantic_hit is not None:
+            return semantic_hit
+
+        try:
+            response = await self._get_async_client().images.generate(
+                model=self.model,
+                prompt=prompt,
+                size=size or self.size,
+                quality=quality or self.quality,
+                style=style,
+                n=1
+            )
+
+            # Download over the shared keep-alive pool
+            image_url = response.data[0].url
+            content = await self._download(image_url)
+
+            image = Image.open(io.BytesIO(content))
+            await asyncio.to_thread(
+                self._cache_store, cache_key, content, image
+            )
+            self._semantic_cache_add(embedding, cache_key)
+
+            return image
+
+        except Exception as e:
+            print(f"DALL-E generation error: {e}")
+            return self._create_placeholder_image(prompt)
+
     def generate_multiple_images(
         self,
         prompts: List[str],
@@ -84,38 +311,40 @@ class DalleService:
         Returns:
             List of PIL Image objects
         """
-        images = []
-        for idx, prompt in enumerate(prompts):
-            print(f"Generating image {idx + 1}/{len(prompts)}...")
-            image = self.generate_image(prompt, size, quality, style)
-            images.append(image)
-        
-        return images
+        print(f"Generating {len(prompts)} images...")
+        # Each call is network-bound; fan out across threads while
+        # keeping results in prompt order
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate_image(prompt, size, quality, style),
+                prompts
+            ))
     
-    def _create_placeholder_image(self, prompt: str) -> Image.Image:
-        """Create a placeholder image when API is not available."""
-        from PIL import ImageDraw, ImageFont
-        
-        # Create a gradient background
+    def _placeholder_base(self) -> Image.Image:
+        """Render the shared gradient + title template once per service."""
+        if self._placeholder_template is not None:
+            return self._placeholder_template
+
+        from PIL import ImageDraw
+
+        from app.utils.image_utils import load_font
+
+        # Synthesize the gradient background in one vectorized pass
         width, height = 1024, 1024
-        image = Image.new('RGB', (width, height), color='#667eea')
+        t = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+        rgb_top = np.array([102, 126, 234], dtype=np.float32)
+        rgb_bottom = np.array([247, 129, 162], dtype=np.float32)
+        gradient = (rgb_top * (1 - t) + rgb_bottom * t).astype(np.uint8)
+        image = Image.fromarray(
+            np.broadcast_to(gradient[:, None, :], (height, width, 3)).copy(),
+            'RGB'
+        )
         draw = ImageDraw.Draw(image)
-        
-        # Create gradient effect
-        for i in range(height):
-            r = int(102 + (247 - 102) * i / height)
-            g = int(126 + (129 - 126) * i / height)
-            b = int(234 + (162 - 234) * i / height)
-            draw.line([(0, i), (width, i)], fill=(r, g, b))
-        
+
         # Add text
-        try:
-            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-        
+        font_large = load_font(60)
+        font_small = load_font(30)
+
         # Title
         title = "AI Creative Studio"
         title_bbox = draw.textbbox((0, 0), title, font=font_large)
@@ -126,7 +355,7 @@ class DalleService:
             fill='white',
             font=font_large
         )
-        
+
         # Subtitle
         subtitle = "Generated Creative"
         subtitle_bbox = draw.textbbox((0, 0), subtitle, font=font_small)
@@ -137,7 +366,23 @@ class DalleService:
             fill='white',
             font=font_small
         )
-        
+
+        self._placeholder_template = image
+        return image
+
+    def _create_placeholder_image(self, prompt: str) -> Image.Image:
+        """Create a placeholder image when API is not available."""
+        from PIL import ImageDraw
+
+        from app.utils.image_utils import load_font
+
+        # Only the prompt preview varies; copy the cached template and
+        # draw the one changing line
+        image = self._placeholder_base().copy()
+        draw = ImageDraw.Draw(image)
+        font_small = load_font(30)
+        width, height = image.size
+
         # Prompt preview (truncated)
         prompt_preview = prompt[:50] + "..." if len(prompt) > 50 else prompt
         prompt_bbox = draw.textbbox((0, 0), prompt_preview, font=font_small)
@@ -148,5 +393,5 @@ class DalleService:
             fill=(255, 255, 255),
             font=font_small
         )
-        
+
         return image
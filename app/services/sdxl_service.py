@@ -1,6 +1,10 @@
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw
 from typing import Optional, List
 
+from app.utils.image_utils import load_font
+
 
 class SDXLService:
     """Service for generating images using Stable Diffusion XL."""
@@ -58,34 +62,33 @@ class SDXLService:
         Returns:
             List of PIL Image objects
         """
-        images = []
-        for idx, prompt in enumerate(prompts):
-            print(f"Generating SDXL image {idx + 1}/{len(prompts)}...")
-            image = self.generate_image(prompt, negative_prompt, width, height, steps, cfg_scale)
-            images.append(image)
-        
-        return images
+        print(f"Generating {len(prompts)} SDXL images...")
+        # Each call is network-bound; fan out across threads while
+        # keeping results in prompt order
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate_image(
+                    prompt, negative_prompt, width, height, steps, cfg_scale
+                ),
+                prompts
+            ))
     
     def _create_placeholder_image(self, prompt: str, width: int = 1024, height: int = 1024) -> Image.Image:
         """Create a placeholder image."""
-        # Create a gradient background
-        image = Image.new('RGB', (width, height), color='#764ba2')
+        # Synthesize the gradient background in one vectorized pass
+        t = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+        rgb_top = np.array([118, 75, 162], dtype=np.float32)
+        rgb_bottom = np.array([245, 106, 255], dtype=np.float32)
+        gradient = (rgb_top * (1 - t) + rgb_bottom * t).astype(np.uint8)
+        image = Image.fromarray(
+            np.broadcast_to(gradient[:, None, :], (height, width, 3)).copy(),
+            'RGB'
+        )
         draw = ImageDraw.Draw(image)
         
-        # Create gradient effect
-        for i in range(height):
-            r = int(118 + (245 - 118) * i / height)
-            g = int(75 + (106 - 75) * i / height)
-            b = int(162 + (255 - 162) * i / height)
-            draw.line([(0, i), (width, i)], fill=(r, g, b))
-        
         # Add text
-        try:
-            font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 25)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_large = load_font(50)
+        font_small = load_font(25)
         
         # Title
         title = "SDXL Creative"
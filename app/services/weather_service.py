@@ -1,29 +1,140 @@
 import requests
+import time
+from functools import lru_cache
 from typing import Dict, Optional
 import os
 from datetime import datetime
 
+# Weather changes slowly; cache responses in 10-minute buckets so
+# repeated context lookups for the same city skip the HTTP round-trip.
+_WEATHER_CACHE_TTL = 600
+_WEATHER_CACHE_MAX = 256
+
+# Location-based weather patterns, flattened to (city, season) keys so
+# the mock path is a single dict lookup with no per-call construction.
+_SEASONAL_WEATHER = {
+    # India - South
+    ("Bangalore", "winter"): {"temp": 22, "desc": "pleasant weather", "main": "Clear"},
+    ("Bangalore", "spring"): {"temp": 28, "desc": "warm and sunny", "main": "Clear"},
+    ("Bangalore", "monsoon"): {"temp": 24, "desc": "rainy", "main": "Rain"},
+    ("Bangalore", "autumn"): {"temp": 25, "desc": "pleasant", "main": "Clouds"},
+    ("Chennai", "winter"): {"temp": 28, "desc": "warm", "main": "Clear"},
+    ("Chennai", "spring"): {"temp": 35, "desc": "hot and sunny", "main": "Clear"},
+    ("Chennai", "monsoon"): {"temp": 30, "desc": "humid with rain", "main": "Rain"},
+    ("Chennai", "autumn"): {"temp": 32, "desc": "hot", "main": "Clear"},
+    ("Hyderabad", "winter"): {"temp": 24, "desc": "pleasant", "main": "Clear"},
+    ("Hyderabad", "spring"): {"temp": 32, "desc": "hot", "main": "Clear"},
+    ("Hyderabad", "monsoon"): {"temp": 26, "desc": "rainy", "main": "Rain"},
+    ("Hyderabad", "autumn"): {"temp": 28, "desc": "warm", "main": "Clouds"},
+
+    # India - North
+    ("Delhi", "winter"): {"temp": 15, "desc": "cold", "main": "Clouds"},
+    ("Delhi", "spring"): {"temp": 30, "desc": "hot", "main": "Clear"},
+    ("Delhi", "monsoon"): {"temp": 32, "desc": "humid with rain", "main": "Rain"},
+    ("Delhi", "autumn"): {"temp": 28, "desc": "pleasant", "main": "Clear"},
+    ("Gurgaon", "winter"): {"temp": 14, "desc": "cold", "main": "Clouds"},
+    ("Gurgaon", "spring"): {"temp": 31, "desc": "hot", "main": "Clear"},
+    ("Gurgaon", "monsoon"): {"temp": 33, "desc": "humid", "main": "Rain"},
+    ("Gurgaon", "autumn"): {"temp": 27, "desc": "pleasant", "main": "Clear"},
+
+    # India - West
+    ("Mumbai", "winter"): {"temp": 26, "desc": "pleasant", "main": "Clear"},
+    ("Mumbai", "spring"): {"temp": 32, "desc": "hot and humid", "main": "Clear"},
+    ("Mumbai", "monsoon"): {"temp": 28, "desc": "heavy rain", "main": "Rain"},
+    ("Mumbai", "autumn"): {"temp": 30, "desc": "humid", "main": "Clouds"},
+    ("Pune", "winter"): {"temp": 20, "desc": "cool", "main": "Clear"},
+    ("Pune", "spring"): {"temp": 30, "desc": "warm", "main": "Clear"},
+    ("Pune", "monsoon"): {"temp": 24, "desc": "rainy", "main": "Rain"},
+    ("Pune", "autumn"): {"temp": 26, "desc": "pleasant", "main": "Clouds"},
+
+    # India - East
+    ("Kolkata", "winter"): {"temp": 22, "desc": "pleasant", "main": "Clear"},
+    ("Kolkata", "spring"): {"temp": 34, "desc": "hot and humid", "main": "Clear"},
+    ("Kolkata", "monsoon"): {"temp": 30, "desc": "heavy rain", "main": "Rain"},
+    ("Kolkata", "autumn"): {"temp": 28, "desc": "humid", "main": "Clouds"},
+
+    # US - West Coast
+    ("Los Angeles", "winter"): {"temp": 18, "desc": "mild", "main": "Clear"},
+    ("Los Angeles", "spring"): {"temp": 22, "desc": "pleasant", "main": "Clear"},
+    ("Los Angeles", "monsoon"): {"temp": 28, "desc": "warm and sunny", "main": "Clear"},
+    ("Los Angeles", "autumn"): {"temp": 24, "desc": "pleasant", "main": "Clear"},
+    ("San Francisco", "winter"): {"temp": 14, "desc": "cool and foggy", "main": "Clouds"},
+    ("San Francisco", "spring"): {"temp": 18, "desc": "mild", "main": "Clouds"},
+    ("San Francisco", "monsoon"): {"temp": 20, "desc": "cool", "main": "Clouds"},
+    ("San Francisco", "autumn"): {"temp": 19, "desc": "mild", "main": "Clouds"},
+
+    # US - East Coast
+    ("New York", "winter"): {"temp": 2, "desc": "cold", "main": "Snow"},
+    ("New York", "spring"): {"temp": 18, "desc": "mild", "main": "Clear"},
+    ("New York", "monsoon"): {"temp": 28, "desc": "hot and humid", "main": "Clear"},
+    ("New York", "autumn"): {"temp": 16, "desc": "cool", "main": "Clouds"},
+
+    # UK
+    ("London", "winter"): {"temp": 8, "desc": "cold and rainy", "main": "Rain"},
+    ("London", "spring"): {"temp": 14, "desc": "mild", "main": "Clouds"},
+    ("London", "monsoon"): {"temp": 20, "desc": "pleasant", "main": "Clouds"},
+    ("London", "autumn"): {"temp": 12, "desc": "cool and rainy", "main": "Rain"},
+}
+
+_DEFAULT_WEATHER = {"temp": 25, "desc": "pleasant", "main": "Clear"}
+
+
+@lru_cache(maxsize=None)
+def _mock_weather(city: str, season: str) -> Dict:
+    """Build mock weather for (city, season); pure, so memoized forever."""
+    weather = _SEASONAL_WEATHER.get((city, season), _DEFAULT_WEATHER)
+
+    return {
+        "city": city,
+        "temperature": weather["temp"],
+        "feels_like": weather["temp"],
+        "humidity": 65,
+        "description": weather["desc"],
+        "main": weather["main"],
+        "icon": "01d",
+        "wind_speed": 3.5,
+        "clouds": 20,
+        "source": "location_based_mock"
+    }
+
 
 class WeatherService:
     """Service for fetching weather information based on target location."""
-    
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize weather service with optional API key."""
         self.api_key = api_key or os.getenv("WEATHER_API_KEY")
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
-    
+        self._weather_cache: Dict[tuple, Dict] = {}
+
     def get_weather(self, city: str, country_code: str = "IN") -> Dict:
         """
         Get current weather for the target city.
         Uses real API if key available, otherwise uses intelligent mock data.
-        
+        Results are cached per (city, country, 10-minute bucket).
+
         Args:
             city: Target city for the ad campaign
             country_code: Country code (default: IN for India)
-        
+
         Returns:
             Weather data dictionary for the target location
         """
+        cache_key = (city, country_code, int(time.time() // _WEATHER_CACHE_TTL))
+        cached = self._weather_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        weather = self._fetch_weather(city, country_code)
+
+        if len(self._weather_cache) >= _WEATHER_CACHE_MAX:
+            self._weather_cache.clear()
+        self._weather_cache[cache_key] = weather
+
+        return weather
+
+    def _fetch_weather(self, city: str, country_code: str = "IN") -> Dict:
+        """Fetch weather from the API or fall back to mock data."""
         # Try real API first if key is available
         if self.api_key and self.api_key != "your_weather_api_key_here":
             try:
@@ -61,121 +172,7 @@ class WeatherService:
         Generate realistic weather data based on location and current season.
         This provides contextually accurate weather for the target location.
         """
-        current_month = datetime.now().month
-        season = self.get_season()
-        
-        # Location-based weather patterns
-        location_weather = {
-            # India - South
-            "Bangalore": self._get_seasonal_weather(season, {
-                "winter": {"temp": 22, "desc": "pleasant weather", "main": "Clear"},
-                "spring": {"temp": 28, "desc": "warm and sunny", "main": "Clear"},
-                "monsoon": {"temp": 24, "desc": "rainy", "main": "Rain"},
-                "autumn": {"temp": 25, "desc": "pleasant", "main": "Clouds"}
-            }),
-            "Chennai": self._get_seasonal_weather(season, {
-                "winter": {"temp": 28, "desc": "warm", "main": "Clear"},
-                "spring": {"temp": 35, "desc": "hot and sunny", "main": "Clear"},
-                "monsoon": {"temp": 30, "desc": "humid with rain", "main": "Rain"},
-                "autumn": {"temp": 32, "desc": "hot", "main": "Clear"}
-            }),
-            "Hyderabad": self._get_seasonal_weather(season, {
-                "winter": {"temp": 24, "desc": "pleasant", "main": "Clear"},
-                "spring": {"temp": 32, "desc": "hot", "main": "Clear"},
-                "monsoon": {"temp": 26, "desc": "rainy", "main": "Rain"},
-                "autumn": {"temp": 28, "desc": "warm", "main": "Clouds"}
-            }),
-            
-            # India - North
-            "Delhi": self._get_seasonal_weather(season, {
-                "winter": {"temp": 15, "desc": "cold", "main": "Clouds"},
-                "spring": {"temp": 30, "desc": "hot", "main": "Clear"},
-                "monsoon": {"temp": 32, "desc": "humid with rain", "main": "Rain"},
-                "autumn": {"temp": 28, "desc": "pleasant", "main": "Clear"}
-            }),
-            "Gurgaon": self._get_seasonal_weather(season, {
-                "winter": {"temp": 14, "desc": "cold", "main": "Clouds"},
-                "spring": {"temp": 31, "desc": "hot", "main": "Clear"},
-                "monsoon": {"temp": 33, "desc": "humid", "main": "Rain"},
-                "autumn": {"temp": 27, "desc": "pleasant", "main": "Clear"}
-            }),
-            
-            # India - West
-            "Mumbai": self._get_seasonal_weather(season, {
-                "winter": {"temp": 26, "desc": "pleasant", "main": "Clear"},
-                "spring": {"temp": 32, "desc": "hot and humid", "main": "Clear"},
-                "monsoon": {"temp": 28, "desc": "heavy rain", "main": "Rain"},
-                "autumn": {"temp": 30, "desc": "humid", "main": "Clouds"}
-            }),
-            "Pune": self._get_seasonal_weather(season, {
-                "winter": {"temp": 20, "desc": "cool", "main": "Clear"},
-                "spring": {"temp": 30, "desc": "warm", "main": "Clear"},
-                "monsoon": {"temp": 24, "desc": "rainy", "main": "Rain"},
-                "autumn": {"temp": 26, "desc": "pleasant", "main": "Clouds"}
-            }),
-            
-            # India - East
-            "Kolkata": self._get_seasonal_weather(season, {
-                "winter": {"temp": 22, "desc": "pleasant", "main": "Clear"},
-                "spring": {"temp": 34, "desc": "hot and humid", "main": "Clear"},
-                "monsoon": {"temp": 30, "desc": "heavy rain", "main": "Rain"},
-                "autumn": {"temp": 28, "desc": "humid", "main": "Clouds"}
-            }),
-            
-            # US - West Coast
-            "Los Angeles": self._get_seasonal_weather(season, {
-                "winter": {"temp": 18, "desc": "mild", "main": "Clear"},
-                "spring": {"temp": 22, "desc": "pleasant", "main": "Clear"},
-                "monsoon": {"temp": 28, "desc": "warm and sunny", "main": "Clear"},
-                "autumn": {"temp": 24, "desc": "pleasant", "main": "Clear"}
-            }),
-            "San Francisco": self._get_seasonal_weather(season, {
-                "winter": {"temp": 14, "desc": "cool and foggy", "main": "Clouds"},
-                "spring": {"temp": 18, "desc": "mild", "main": "Clouds"},
-                "monsoon": {"temp": 20, "desc": "cool", "main": "Clouds"},
-                "autumn": {"temp": 19, "desc": "mild", "main": "Clouds"}
-            }),
-            
-            # US - East Coast
-            "New York": self._get_seasonal_weather(season, {
-                "winter": {"temp": 2, "desc": "cold", "main": "Snow"},
-                "spring": {"temp": 18, "desc": "mild", "main": "Clear"},
-                "monsoon": {"temp": 28, "desc": "hot and humid", "main": "Clear"},
-                "autumn": {"temp": 16, "desc": "cool", "main": "Clouds"}
-            }),
-            
-            # UK
-            "London": self._get_seasonal_weather(season, {
-                "winter": {"temp": 8, "desc": "cold and rainy", "main": "Rain"},
-                "spring": {"temp": 14, "desc": "mild", "main": "Clouds"},
-                "monsoon": {"temp": 20, "desc": "pleasant", "main": "Clouds"},
-                "autumn": {"temp": 12, "desc": "cool and rainy", "main": "Rain"}
-            }),
-        }
-        
-        # Get weather for city or use default
-        weather = location_weather.get(city, {
-            "temp": 25,
-            "desc": "pleasant",
-            "main": "Clear"
-        })
-        
-        return {
-            "city": city,
-            "temperature": weather["temp"],
-            "feels_like": weather["temp"],
-            "humidity": 65,
-            "description": weather["desc"],
-            "main": weather["main"],
-            "icon": "01d",
-            "wind_speed": 3.5,
-            "clouds": 20,
-            "source": "location_based_mock"
-        }
-    
-    def _get_seasonal_weather(self, season: str, seasonal_data: dict) -> dict:
-        """Get weather data for current season."""
-        return seasonal_data.get(season, seasonal_data.get("spring", {}))
+        return _mock_weather(city, self.get_season())
     
     def get_weather_context(self, weather_data: Dict) -> str:
         """
@@ -1,9 +1,77 @@
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance
 import io
 import base64
+import os
+from functools import lru_cache
 from typing import Tuple, Optional
 import numpy as np
 
+# Optional libvips backend for PNG encoding; threaded + SIMD, several
+# times faster than PIL's encoder on 1024² creatives.
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
+# Optional numba acceleration for the alpha-blend kernel; the numpy
+# version is already vectorized and stays as the fallback.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+
+def _alpha_blend(logo_rgb: np.ndarray, alpha: np.ndarray, roi: np.ndarray) -> np.ndarray:
+    """Blend uint16 logo RGB over a background region by its alpha."""
+    return ((logo_rgb * alpha + roi * (255 - alpha)) // 255).astype(np.uint8)
+
+
+if _njit is not None:
+    _alpha_blend = _njit(cache=True)(_alpha_blend)
+
+# Resolve a usable TrueType font once at import; parsed fonts are then
+# cached per size so hot paths never re-read the font file.
+_FONT_CANDIDATES = (
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+FONT_PATH = next((path for path in _FONT_CANDIDATES if os.path.exists(path)), None)
+
+
+@lru_cache(maxsize=32)
+def load_font(size: int):
+    """Load the UI font at the given size, falling back to the default."""
+    if FONT_PATH:
+        try:
+            return ImageFont.truetype(FONT_PATH, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def save_png_fast(image: Image.Image, path: str) -> str:
+    """Convert to RGB if needed and save as PNG in a single call.
+
+    Uses libvips when available; compress_level=3 trades a slightly
+    larger file for a much faster encode on 1024² creatives.
+    """
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    if pyvips is not None:
+        try:
+            arr = np.asarray(image)
+            vips_image = pyvips.Image.new_from_memory(
+                arr.tobytes(), image.width, image.height, 3, 'uchar'
+            )
+            vips_image.pngsave(path, compression=3)
+            return path
+        except Exception as e:
+            print(f"pyvips save error: {e}. Falling back to PIL.")
+    image.save(path, format="PNG", compress_level=3)
+    return path
+
 
 def resize_image(image: Image.Image, max_size: Tuple[int, int] = (1024, 1024)) -> Image.Image:
     """Resize image while maintaining aspect ratio."""
@@ -11,11 +79,15 @@ def resize_image(image: Image.Image, max_size: Tuple[int, int] = (1024, 1024)) -
     return image
 
 
-def image_to_base64(image: Image.Image) -> str:
-    """Convert PIL Image to base64 string."""
+def image_to_base64(image: Image.Image, compress_level: int = 1) -> str:
+    """Convert PIL Image to base64 string.
+
+    Defaults to fast PNG compression: previews sent over localhost don't
+    benefit from the extra zlib effort.
+    """
     buffered = io.BytesIO()
-    image.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode()
+    image.save(buffered, format="PNG", compress_level=compress_level, optimize=False)
+    return base64.b64encode(buffered.getbuffer()).decode()
 
 
 def base64_to_image(base64_string: str) -> Image.Image:
@@ -24,6 +96,27 @@ def base64_to_image(base64_string: str) -> Image.Image:
     return Image.open(io.BytesIO(image_data))
 
 
+def prepare_logo_overlay(
+    logo: Image.Image,
+    logo_size: Tuple[int, int] = (150, 150)
+) -> Image.Image:
+    """Pre-resize and convert a logo once for repeated compositing.
+
+    create_composite skips its internal resize for logos already within
+    logo_size, so passing the returned overlay avoids redoing the
+    resize/convert for every creative in a batch.
+    """
+    ratio = min(logo_size[0] / logo.width, logo_size[1] / logo.height, 1.0)
+    if ratio < 1.0:
+        logo = logo.resize(
+            (max(1, round(logo.width * ratio)), max(1, round(logo.height * ratio))),
+            Image.Resampling.BILINEAR
+        )
+    if logo.mode != 'RGBA':
+        logo = logo.convert('RGBA')
+    return logo
+
+
 def create_composite(
     background: Image.Image,
     logo: Optional[Image.Image] = None,
@@ -34,9 +127,14 @@ def create_composite(
     composite = background.copy()
     
     if logo:
-        # Resize logo
-        logo = logo.copy()
-        logo.thumbnail(logo_size, Image.Resampling.LANCZOS)
+        # Resize logo; BILINEAR is ~3x faster than LANCZOS and
+        # indistinguishable at overlay sizes
+        ratio = min(logo_size[0] / logo.width, logo_size[1] / logo.height, 1.0)
+        if ratio < 1.0:
+            logo = logo.resize(
+                (max(1, round(logo.width * ratio)), max(1, round(logo.height * ratio))),
+                Image.Resampling.BILINEAR
+            )
         
         # Calculate position
         if logo_position == "top-right":
@@ -55,9 +153,17 @@ def create_composite(
             x = (composite.width - logo.width) // 2
             y = (composite.height - logo.height) // 2
         
-        # Paste logo with transparency
+        # Paste logo with transparency; the alpha blend runs as one
+        # vectorized pass over the logo-sized region only
         if logo.mode == 'RGBA':
-            composite.paste(logo, (x, y), logo)
+            logo_arr = np.asarray(logo, dtype=np.uint16)
+            roi = np.asarray(
+                composite.crop((x, y, x + logo.width, y + logo.height)),
+                dtype=np.uint16
+            )[:, :, :3]
+            alpha = logo_arr[:, :, 3:4]
+            blended = _alpha_blend(logo_arr[:, :, :3], alpha, roi)
+            composite.paste(Image.fromarray(blended, 'RGB'), (x, y))
         else:
             composite.paste(logo, (x, y))
     
@@ -87,12 +193,8 @@ def add_text_overlay(
 ) -> Image.Image:
     """Add text overlay to image."""
     draw = ImageDraw.Draw(image, 'RGBA')
-    
-    # Try to use a nice font, fallback to default
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-    except:
-        font = ImageFont.load_default()
+
+    font = load_font(font_size)
     
     # Get text bounding box
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -1,71 +1,175 @@
-from colorthief import ColorThief
 from PIL import Image
-import io
+import hashlib
 from typing import List, Tuple, Dict
 import numpy as np
-from sklearn.cluster import KMeans
+
+# Optional JIT-compiled median-cut quantizer; K-means on the decoded
+# pixels is the fallback when the package is not installed.
+try:
+    from mmcq_numba.quantize import mmcq as _mmcq
+except ImportError:
+    _mmcq = None
+
+# Optional numba acceleration for the batched brightness kernel; the
+# plain numpy version is already vectorized and stays as the fallback.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+
+def brightness_batch(rgb: np.ndarray) -> np.ndarray:
+    """Perceived brightness (0-255) for an (N, 3) array of RGB triples."""
+    rgb = rgb.astype(np.float32)
+    return 0.299 * rgb[:, 0] + 0.587 * rgb[:, 1] + 0.114 * rgb[:, 2]
+
+
+if _njit is not None:
+    brightness_batch = _njit(cache=True, fastmath=True)(brightness_batch)
+
+
+def _kmeans_rgb(pixels: np.ndarray, k: int, iters: int = 20) -> np.ndarray:
+    """Lloyd's k-means specialized for (N, 3) float32 color data.
+
+    A 3D problem with a few thousand points and k<=8 fits in cache; a
+    direct loop here avoids all of sklearn's estimator and validation
+    overhead on the palette hot path.
+    """
+    rng = np.random.default_rng(42)
+    sample = pixels[rng.choice(len(pixels), size=min(256, len(pixels)), replace=False)]
+
+    # k-means++ seeding over the sample
+    centers = np.empty((k, 3), dtype=np.float32)
+    centers[0] = sample[rng.integers(len(sample))]
+    for i in range(1, k):
+        dist2 = ((sample[:, None, :] - centers[None, :i, :]) ** 2).sum(axis=2).min(axis=1)
+        total = dist2.sum()
+        if total <= 0:
+            centers[i:] = centers[0]
+            break
+        centers[i] = sample[rng.choice(len(sample), p=dist2 / total)]
+
+    for _ in range(iters):
+        dist2 = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = dist2.argmin(axis=1)
+        new_centers = centers.copy()
+        for j in range(k):
+            members = pixels[labels == j]
+            if len(members):
+                new_centers[j] = members.mean(axis=0)
+        if np.allclose(new_centers, centers):
+            return new_centers
+        centers = new_centers
+
+    return centers
+
+# Cache extraction results by image content hash so repeated calls with
+# the same logo/product image skip the quantization pass entirely.
+_DOMINANT_COLOR_CACHE: Dict[Tuple[bytes, int], List[Tuple[int, int, int]]] = {}
+_DOMINANT_COLOR_CACHE_MAX = 128
 
 
 def extract_dominant_colors(image: Image.Image, num_colors: int = 5) -> List[Tuple[int, int, int]]:
-    """Extract dominant colors from an image using ColorThief."""
+    """Extract dominant colors by quantizing the decoded pixels.
+
+    The input image is never mutated.
+    """
     # Convert to RGB if needed
     if image.mode != 'RGB':
         image = image.convert('RGB')
-    
-    # Save to bytes
-    img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format='PNG')
-    img_byte_arr.seek(0)
-    
-    # Extract colors
-    color_thief = ColorThief(img_byte_arr)
-    
-    if num_colors == 1:
-        dominant_color = color_thief.get_color(quality=1)
-        return [dominant_color]
-    else:
-        palette = color_thief.get_palette(color_count=num_colors, quality=1)
-        return palette
+
+    # Check content-hash cache first
+    digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+    cache_key = (digest, num_colors)
+    cached = _DOMINANT_COLOR_CACHE.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
+    palette = None
+
+    # Out-of-place box downsample: avoids both mutating the caller's
+    # image and the slow copy()+thumbnail() workaround
+    factor = max(1, max(image.size) // 200)
+    small = image.reduce(factor) if factor > 1 else image
+
+    # Fast path: JIT-compiled median-cut over the downsampled pixels
+    if _mmcq is not None:
+        try:
+            pixels = np.asarray(small).reshape(-1, 3).astype(np.int64)
+            cmap = _mmcq(pixels, max(num_colors, 2))
+            palette = [
+                tuple(int(channel) for channel in color)
+                for color in cmap.palette[:num_colors]
+            ]
+        except Exception:
+            palette = None
+
+    if palette is None:
+        # Cluster the already-decoded pixels directly; no PNG
+        # re-encode round-trip
+        pixels = np.ascontiguousarray(
+            np.asarray(small, dtype=np.float32).reshape(-1, 3)
+        )
+        palette = [
+            tuple(int(channel) for channel in center)
+            for center in _kmeans_rgb(pixels, num_colors)
+        ]
+
+    if len(_DOMINANT_COLOR_CACHE) >= _DOMINANT_COLOR_CACHE_MAX:
+        _DOMINANT_COLOR_CACHE.pop(next(iter(_DOMINANT_COLOR_CACHE)))
+    _DOMINANT_COLOR_CACHE[cache_key] = list(palette)
+
+    return palette
 
 
 def extract_colors_kmeans(image: Image.Image, num_colors: int = 5) -> List[Tuple[int, int, int]]:
-    """Extract dominant colors using K-means clustering."""
+    """Extract dominant colors using K-means clustering.
+
+    The input image is never mutated.
+    """
     # Convert to RGB if needed
     if image.mode != 'RGB':
         image = image.convert('RGB')
     
-    # Resize for faster processing
-    image.thumbnail((150, 150))
-    
-    # Convert to numpy array
-    img_array = np.array(image)
-    pixels = img_array.reshape(-1, 3)
-    
-    # Apply K-means
-    kmeans = KMeans(n_clusters=num_colors, random_state=42, n_init=10)
-    kmeans.fit(pixels)
-    
+    # Integer-ratio box downsample to ~100px; much faster than
+    # thumbnail's default resampling and statistically identical for
+    # dominant-color extraction
+    factor = max(1, max(image.size) // 100)
+    small = image.reduce(factor) if factor > 1 else image
+
+    # Convert to contiguous float32 pixels in one pass
+    pixels = np.ascontiguousarray(
+        np.asarray(small, dtype=np.float32).reshape(-1, 3)
+    )
+
     # Get cluster centers (dominant colors)
-    colors = kmeans.cluster_centers_.astype(int)
-    
+    colors = _kmeans_rgb(pixels, num_colors).astype(int)
+
     return [tuple(color) for color in colors]
 
 
 def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
     """Convert RGB tuple to hex color string."""
-    return '#{:02x}{:02x}{:02x}'.format(rgb[0], rgb[1], rgb[2])
+    return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
+
+
+def rgb_to_hex_batch(arr: np.ndarray) -> List[str]:
+    """Convert an (N, 3) RGB array to hex strings in one packed pass."""
+    arr = np.asarray(arr, dtype=np.uint32)
+    packed = (arr[:, 0] << 16) | (arr[:, 1] << 8) | arr[:, 2]
+    return [f'#{value:06x}' for value in packed.tolist()]
 
 
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """Convert hex color string to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    value = int(hex_color.lstrip('#'), 16)
+    return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
 
 
 def get_color_brightness(rgb: Tuple[int, int, int]) -> float:
     """Calculate perceived brightness of a color (0-255)."""
-    # Using perceived brightness formula
-    return (0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2])
+    # Thin scalar wrapper over the batched kernel
+    return float(brightness_batch(np.asarray([rgb], dtype=np.uint8))[0])
 
 
 def is_dark_color(rgb: Tuple[int, int, int], threshold: int = 128) -> bool:
@@ -83,36 +187,34 @@ def get_contrasting_color(rgb: Tuple[int, int, int]) -> Tuple[int, int, int]:
 
 def get_brand_palette_info(colors: List[Tuple[int, int, int]]) -> Dict:
     """Get detailed information about a brand color palette."""
-    hex_colors = [rgb_to_hex(color) for color in colors]
-    
-    # Find primary (most vibrant/saturated) color
-    primary_idx = 0
-    max_saturation = 0
-    
-    for idx, color in enumerate(colors):
-        r, g, b = color
-        max_val = max(r, g, b)
-        min_val = min(r, g, b)
-        saturation = (max_val - min_val) / max_val if max_val > 0 else 0
-        
-        if saturation > max_saturation:
-            max_saturation = saturation
-            primary_idx = idx
-    
+    arr = np.asarray(colors, dtype=np.int16)
+    hex_colors = rgb_to_hex_batch(arr)
+
+    # Find primary (most vibrant/saturated) color in one vectorized pass
+    mx = arr.max(axis=1)
+    mn = arr.min(axis=1)
+    saturation = np.where(mx > 0, (mx - mn) / np.maximum(mx, 1), 0.0)
+    primary_idx = int(saturation.argmax())
+
+    # Compute brightness once and reuse it for both the per-color
+    # descriptions and the dark-palette vote
+    brightness = brightness_batch(arr)
+    dark_mask = brightness < 128
+
     return {
         "colors": colors,
         "hex_colors": hex_colors,
         "primary_color": colors[primary_idx],
         "primary_hex": hex_colors[primary_idx],
-        "is_dark_palette": sum(is_dark_color(c) for c in colors) > len(colors) / 2,
+        "is_dark_palette": bool(dark_mask.sum() > len(colors) / 2),
         "color_descriptions": [
             {
                 "rgb": color,
                 "hex": hex_color,
-                "brightness": get_color_brightness(color),
-                "is_dark": is_dark_color(color)
+                "brightness": float(brightness[idx]),
+                "is_dark": bool(dark_mask[idx])
             }
-            for color, hex_color in zip(colors, hex_colors)
+            for idx, (color, hex_color) in enumerate(zip(colors, hex_colors))
         ]
     }
 
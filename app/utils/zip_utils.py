@@ -1,10 +1,53 @@
 import zipfile
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
+# Optional fast JSON encoder for metadata.json; stdlib json remains the
+# fallback when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _ZipStream:
+    """
+    Minimal non-seekable file object for streaming zipfile output.
+
+    zipfile writes entries with data descriptors when the target is not
+    seekable, so chunks can be handed to the client as they are
+    produced instead of buffering the whole archive.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
 def create_creative_package(
     output_path: str,
@@ -28,52 +71,125 @@ def create_creative_package(
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_path, exist_ok=True)
-    
+
+    # One timestamp for the package name, metadata and README
+    now = datetime.now()
+
     # Generate package name
     if package_name is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        package_name = f"creatives_{timestamp}"
+        package_name = f"creatives_{now.strftime('%Y%m%d_%H%M%S')}"
     
     zip_path = os.path.join(output_path, f"{package_name}.zip")
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    # Read image bytes across worker threads (file I/O releases the
+    # GIL), then append through the single zip writer to keep the
+    # central directory consistent
+    with ThreadPoolExecutor(max_workers=min(len(images) or 1, os.cpu_count() or 4)) as executor:
+        payloads = list(executor.map(_read_file_bytes, images))
+
+    # PNGs are already deflate-compressed, so store them as-is; the
+    # small text entries keep deflate at the fastest level
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
         # Add images
-        for idx, image_path in enumerate(images):
-            if os.path.exists(image_path):
+        for idx, data in enumerate(payloads):
+            if data is not None:
                 # Add to images folder in ZIP
                 arcname = f"images/creative_{idx+1:02d}.png"
-                zipf.write(image_path, arcname)
-        
-        # Create and add captions.txt
-        captions_content = ""
-        for idx, caption in enumerate(captions):
-            captions_content += f"=== Creative {idx+1:02d} ===\n"
-            captions_content += f"{caption}\n\n"
-        
-        zipf.writestr("captions.txt", captions_content)
-        
-        # Create and add metadata.json
-        metadata_content = {
-            "generated_at": datetime.now().isoformat(),
-            "total_creatives": len(images),
-            "creatives": [
-                {
-                    "id": idx + 1,
-                    "filename": f"creative_{idx+1:02d}.png",
-                    "caption": caption,
-                    "metadata": meta
-                }
-                for idx, (caption, meta) in enumerate(zip(captions, metadata))
-            ]
-        }
-        
-        zipf.writestr("metadata.json", json.dumps(metadata_content, indent=2))
-        
-        # Add README
-        readme_content = f"""# AI Creative Studio - Generated Creatives
-
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-Total Creatives: {len(images)}
+                zipf.writestr(arcname, data, compress_type=zipfile.ZIP_STORED)
+
+        zipf.writestr("captions.txt", _build_captions_text(captions))
+        zipf.writestr("metadata.json", _build_metadata_json(len(images), captions, metadata, now))
+        zipf.writestr("README.md", _build_readme(len(images), now))
+
+    return zip_path
+
+
+def iter_creative_package(
+    images: List[str],
+    captions: List[str],
+    metadata: List[Dict]
+) -> Iterator[bytes]:
+    """
+    Stream a creative package ZIP chunk by chunk.
+
+    Yields archive bytes as each entry is written, so a web response
+    can start downloading before the full archive exists and peak
+    memory stays at roughly one image. Images go in uncompressed
+    (PNG is already deflated).
+
+    Args:
+        images: List of image file paths
+        captions: List of captions corresponding to images
+        metadata: List of metadata dicts for each creative
+
+    Yields:
+        Chunks of ZIP archive bytes
+    """
+    stream = _ZipStream()
+
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as zipf:
+        # Let the open() inside write surface missing files instead of
+        # paying an extra stat() per image up front
+        for idx, image_path in enumerate(images):
+            try:
+                zipf.write(image_path, f"images/creative_{idx+1:02d}.png")
+            except FileNotFoundError:
+                continue
+            yield stream.drain()
+
+        now = datetime.now()
+        zipf.writestr("captions.txt", _build_captions_text(captions))
+        zipf.writestr("metadata.json", _build_metadata_json(len(images), captions, metadata, now))
+        zipf.writestr("README.md", _build_readme(len(images), now))
+        yield stream.drain()
+
+    # Central directory written on close
+    yield stream.drain()
+
+
+def _read_file_bytes(path: str) -> Optional[bytes]:
+    """Read a file's bytes, or None if it is missing."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _build_captions_text(captions: List[str]) -> str:
+    """Build the captions.txt content."""
+    return "".join(
+        f"=== Creative {idx+1:02d} ===\n{caption}\n\n"
+        for idx, caption in enumerate(captions)
+    )
+
+
+def _build_metadata_json(total: int, captions: List[str], metadata: List[Dict], now: datetime) -> bytes:
+    """Build the metadata.json content."""
+    metadata_content = {
+        "generated_at": now.isoformat(),
+        "total_creatives": total,
+        "creatives": [
+            {
+                "id": idx + 1,
+                "filename": f"creative_{idx+1:02d}.png",
+                "caption": caption,
+                "metadata": meta
+            }
+            for idx, (caption, meta) in enumerate(zip(captions, metadata))
+        ]
+    }
+    if orjson is not None:
+        return orjson.dumps(metadata_content, option=orjson.OPT_INDENT_2)
+    return json.dumps(metadata_content, indent=2).encode()
+
+
+def _build_readme(total: int, now: datetime) -> str:
+    """Build the package README content."""
+    return f"""# AI Creative Studio - Generated Creatives
+
+Generated: {now.strftime("%Y-%m-%d %H:%M:%S")}
+Total Creatives: {total}
 
 ## Contents
 
@@ -87,9 +203,6 @@ Each creative is numbered and corresponds to its caption and metadata entry.
 
 Enjoy your hyper-personalized, context-aware creatives! 🎨
 """
-        zipf.writestr("README.md", readme_content)
-    
-    return zip_path
 
 
 def get_zip_size(zip_path: str) -> int:
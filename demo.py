@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from PIL import Image, ImageDraw, ImageFont
 
@@ -11,10 +12,37 @@ from app.core.brand_extractor import BrandExtractor
 from app.core.prompt_builder import PromptBuilder
 from app.core.caption_generator import CaptionGenerator
 from app.services.dalle_service import DalleService
-from app.utils.image_utils import create_composite, ensure_rgb
+from app.utils.image_utils import create_composite, ensure_rgb, prepare_logo_overlay
 from app.utils.zip_utils import create_creative_package
 
 
+# Memoized service factories: repeated main() runs (tests, batch jobs)
+# reuse the instances instead of re-initializing models and clients.
+@lru_cache(maxsize=1)
+def _get_context_engine():
+    return ContextEngine()
+
+
+@lru_cache(maxsize=1)
+def _get_brand_extractor():
+    return BrandExtractor()
+
+
+@lru_cache(maxsize=1)
+def _get_prompt_builder():
+    return PromptBuilder()
+
+
+@lru_cache(maxsize=1)
+def _get_caption_generator():
+    return CaptionGenerator()
+
+
+@lru_cache(maxsize=1)
+def _get_dalle_service():
+    return DalleService()
+
+
 def create_sample_logo():
     """Create a sample logo for testing."""
     img = Image.new('RGB', (300, 300), color='#667eea')
@@ -87,11 +115,11 @@ def main():
     
     # Initialize services
     print("🔧 Initializing AI services...")
-    context_engine = ContextEngine()
-    brand_extractor = BrandExtractor()
-    prompt_builder = PromptBuilder()
-    caption_generator = CaptionGenerator()
-    dalle_service = DalleService()
+    context_engine = _get_context_engine()
+    brand_extractor = _get_brand_extractor()
+    prompt_builder = _get_prompt_builder()
+    caption_generator = _get_caption_generator()
+    dalle_service = _get_dalle_service()
     print("✅ Services initialized")
     print()
     
@@ -138,14 +166,16 @@ def main():
     # Generate images
     print("🎨 Generating images with DALL-E...")
     print("   (This may take a minute...)")
-    generated_images = []
-    for idx, prompt in enumerate(prompts):
-        print(f"   Generating image {idx + 1}/{len(prompts)}...", end='\r')
-        image = dalle_service.generate_image(prompt)
-        if image:
-            # Add logo
-            image = create_composite(image, logo_img)
-            generated_images.append(image)
+    # Resize/convert the logo once; every composite reuses the overlay
+    logo_overlay = prepare_logo_overlay(logo_img)
+    # Fan the prompts out concurrently (I/O-bound waits), then add
+    # logos in a separate pass over the results
+    images = dalle_service.generate_multiple_images(prompts)
+    generated_images = [
+        create_composite(image, logo_overlay)
+        for image in images
+        if image
+    ]
     print()
     print(f"✅ {len(generated_images)} images generated")
     print()
@@ -171,7 +201,9 @@ def main():
     for idx, img in enumerate(generated_images):
         img_path = os.path.join(output_dir, f"demo_creative_{idx+1:02d}.png")
         img = ensure_rgb(img)
-        img.save(img_path)
+        # Fast deflate level; these files go straight into the ZIP, so
+        # squeezing out the last few percent isn't worth a slow encode
+        img.save(img_path, format='PNG', optimize=False, compress_level=1)
         image_paths.append(img_path)
     
     # Create metadata
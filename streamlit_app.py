@@ -2,33 +2,47 @@
 AI Creative Studio - Streamlit Application
 Beautiful, modern UI for generating hyper-personalized ad creatives.
 """
+import asyncio
+import hashlib
+import io
+import json
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 from PIL import Image
 import os
+import string
 import time
 from datetime import datetime
 from dotenv import load_dotenv
-import google.generativeai as genai
 
 # Load environment variables
 load_dotenv()
 
-# Import core modules
-from app.core.context_engine import ContextEngine
-from app.core.brand_extractor import BrandExtractor
-from app.core.prompt_builder import PromptBuilder
-from app.core.caption_generator import CaptionGenerator
-from app.services.dalle_service import DalleService
-from app.utils.image_utils import create_composite, ensure_rgb
-from app.utils.zip_utils import create_creative_package
-
-# Initialize Gemini for audience analysis
-TEXT_API_KEY = os.getenv("TEXT_API_KEY")
-if TEXT_API_KEY and TEXT_API_KEY != "your_gemini_api_key_here":
-    genai.configure(api_key=TEXT_API_KEY)
-    gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-else:
-    gemini_model = None
+# Heavy imports (google.generativeai, the core services and their numpy/
+# OpenAI dependencies) are deferred into the cached factories below so
+# cold start only pays for what the current interaction actually uses.
+
+
+@st.cache_resource(show_spinner=False)
+def _get_gemini_model():
+    """Lazily build the Gemini model used for audience analysis."""
+    api_key = os.getenv("TEXT_API_KEY")
+    if not api_key or api_key == "your_gemini_api_key_here":
+        return None
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-2.5-flash')
+
+
+@st.cache_resource(show_spinner=False)
+def _get_services():
+    """Construct the generation services once per process."""
+    from app.core.context_engine import ContextEngine
+    from app.core.prompt_builder import PromptBuilder
+    from app.core.caption_generator import CaptionGenerator
+    from app.services.dalle_service import DalleService
+    return ContextEngine(), PromptBuilder(), CaptionGenerator(), DalleService()
 
 # Page configuration
 st.set_page_config(
@@ -38,8 +52,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for beautiful UI
-st.markdown("""
+# Custom CSS for beautiful UI; cached so reruns reuse the built string
+# instead of re-creating the multi-kilobyte literal every time
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    return """
 <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
@@ -133,13 +150,15 @@ st.markdown("""
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # Initialize session state
 if 'generated_creatives' not in st.session_state:
     st.session_state.generated_creatives = []
 if 'generated_captions' not in st.session_state:
     st.session_state.generated_captions = []
+if 'creative_pngs' not in st.session_state:
+    st.session_state.creative_pngs = []
 if 'zip_path' not in st.session_state:
     st.session_state.zip_path = None
 if 'selected_for_refinement' not in st.session_state:
@@ -175,9 +194,162 @@ LOCATION_DATA = {
     }
 }
 
+# Precomputed indices built once at import; the selectboxes and the
+# recommended-city filter re-run on every widget interaction, so these
+# turn per-rerun traversals into O(1) lookups
+COUNTRIES = list(LOCATION_DATA.keys())
+REGIONS_BY_COUNTRY = {
+    country: list(regions.keys())
+    for country, regions in LOCATION_DATA.items()
+}
+CITY_SETS = {
+    (country, region): set(cities)
+    for country, regions in LOCATION_DATA.items()
+    for region, cities in regions.items()
+}
+
+
+@st.cache_data(show_spinner=False)
+def _cached_brand_info(logo_bytes, product_bytes, brand_name: str, product_category: str) -> dict:
+    """Extract brand info, cached on the raw upload bytes.
+
+    Changing only sliders/selectboxes no longer re-decodes the images
+    or re-runs palette clustering on every Generate click.
+    """
+    from app.core.brand_extractor import BrandExtractor
+
+    logo_img = Image.open(io.BytesIO(logo_bytes)) if logo_bytes else None
+    product_img = Image.open(io.BytesIO(product_bytes)) if product_bytes else None
+    return BrandExtractor().extract_brand_info(
+        logo_image=logo_img,
+        product_image=product_img,
+        brand_name=brand_name,
+        product_category=product_category
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_context(city: str, product_category: str) -> dict:
+    """Fetch context for a city; weather moves slowly, so 10 min is safe."""
+    from app.core.context_engine import ContextEngine
+
+    return ContextEngine().get_context(city=city, product_category=product_category)
+
+
+# Audience analyses also persist to disk so they survive restarts and
+# redeploys, which st.cache_data (per-process) does not.
+_AUDIENCE_CACHE_DIR = os.getenv("AUDIENCE_CACHE_DIR", "cache/audience")
+
+
+def _audience_cache_path(brand_name: str, product_category: str, company_description: str) -> str:
+    raw = f"{brand_name}|{product_category}|{company_description}"
+    key = hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+    return os.path.join(_AUDIENCE_CACHE_DIR, f"{key}.json")
+
+
+def _audience_cache_get(cache_path: str):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _audience_cache_put(cache_path: str, analysis: dict) -> None:
+    try:
+        os.makedirs(_AUDIENCE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(analysis, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Audience cache write error: {e}")
+
+
+class _ProgressReporter:
+    """Coalesce progress/status updates to at most ~4 Hz.
+
+    Each progress_bar/status_text call is a WebSocket frame to the
+    browser; rate-limiting keeps redraw traffic flat however quickly
+    the pipeline moves between steps. Milestones can force through.
+    """
+
+    def __init__(self, progress_bar, status_text, min_interval: float = 0.25):
+        self._bar = progress_bar
+        self._status = status_text
+        self._min_interval = min_interval
+        self._last = 0.0
+
+    def update(self, percent: int, message: str = None, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last < self._min_interval:
+            return
+        self._bar.progress(percent)
+        if message is not None:
+            self._status.text(message)
+        self._last = now
+
+
+def _encode_png(image: Image.Image) -> bytes:
+    """Encode a creative to PNG bytes for display.
+
+    st.image re-encodes a PIL image on every rerun; feeding it
+    pre-encoded bytes makes redraws a straight pass-through.
+    """
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", compress_level=1, optimize=False)
+    return buf.getvalue()
+
+
+def _decoded_upload(upload, state_key: str) -> Image.Image:
+    """Decode an uploaded image once and reuse it across reruns.
+
+    The preview and the generation path both need the decoded image;
+    keying on the upload's file_id means the PNG decoder runs once per
+    upload instead of once per use per rerun.
+    """
+    id_key = f"{state_key}_file_id"
+    if st.session_state.get(id_key) != upload.file_id:
+        st.session_state[state_key] = Image.open(upload).copy()
+        st.session_state[id_key] = upload.file_id
+    return st.session_state[state_key]
+
 
+# Audience prompt compiled once at import; each call is a single
+# substitution instead of rebuilding the block from an f-string
+_AUDIENCE_TMPL = string.Template("""Analyze the target audience for this brand:
+
+Brand Name: $brand
+Product Category: $category
+Company Description: $description
+
+Provide a detailed analysis in JSON format with:
+1. Primary age group (e.g., "18-25", "25-35", "35-50")
+2. Demographics (lifestyle, income level, interests)
+3. Best regions/cities for marketing (be specific)
+4. Key insights about customer behavior
+5. Recommended top 3 cities in India for this product
+
+Return ONLY valid JSON, no other text.""")
+
+
+def _extract_json_text(result_text: str) -> str:
+    """Strip markdown code fences from a model response."""
+    if "```json" in result_text:
+        return result_text.split("```json")[1].split("```")[0].strip()
+    if "```" in result_text:
+        return result_text.split("```")[1].split("```")[0].strip()
+    return result_text
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
 def analyze_target_audience(brand_name: str, product_category: str, company_description: str = "") -> dict:
-    """Use LLM to analyze target audience and suggest best locations."""
+    """Use LLM to analyze target audience and suggest best locations.
+
+    Results are cached for an hour per (brand, category, description)
+    so repeated clicks return instantly instead of re-hitting Gemini.
+    """
+    gemini_model = _get_gemini_model()
     if not gemini_model:
         # Fallback analysis
         return {
@@ -187,35 +359,45 @@ def analyze_target_audience(brand_name: str, product_category: str, company_desc
             "insights": "Target audience likely consists of urban professionals interested in quality products.",
             "recommended_cities": ["Bangalore", "Mumbai", "Delhi"]
         }
-    
-    try:
-        prompt = f"""Analyze the target audience for this brand:
 
-Brand Name: {brand_name}
-Product Category: {product_category}
-Company Description: {company_description if company_description else "Not provided"}
+    # Disk cache first: repeat analyses survive process restarts
+    cache_path = _audience_cache_path(brand_name, product_category, company_description)
+    cached = _audience_cache_get(cache_path)
+    if cached is not None:
+        return cached
 
-Provide a detailed analysis in JSON format with:
-1. Primary age group (e.g., "18-25", "25-35", "35-50")
-2. Demographics (lifestyle, income level, interests)
-3. Best regions/cities for marketing (be specific)
-4. Key insights about customer behavior
-5. Recommended top 3 cities in India for this product
-
-Return ONLY valid JSON, no other text."""
+    try:
+        prompt = _AUDIENCE_TMPL.substitute(
+            brand=brand_name,
+            category=product_category,
+            description=company_description or "Not provided"
+        )
 
-        response = gemini_model.generate_content(prompt)
-        result_text = response.text.strip()
-        
-        # Try to parse JSON
-        import json
-        # Remove markdown code blocks if present
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0].strip()
-        
-        analysis = json.loads(result_text)
+        # Stream tokens into a placeholder so the user sees the analysis
+        # forming at time-to-first-token instead of a blocking spinner.
+        # Chunks accumulate in a list (O(n), no quadratic regrowth) and
+        # a parse is only attempted when the text could plausibly be
+        # complete JSON — i.e. it ends with a closing brace/bracket.
+        stream = gemini_model.generate_content(prompt, stream=True)
+        placeholder = st.empty()
+        chunks = []
+        analysis = None
+        for chunk in stream:
+            if not chunk.text:
+                continue
+            chunks.append(chunk.text)
+            placeholder.markdown("".join(chunks))
+            if chunk.text.rstrip().endswith(("}", "]")):
+                try:
+                    analysis = json.loads(_extract_json_text("".join(chunks)))
+                    break
+                except json.JSONDecodeError:
+                    pass
+        placeholder.empty()
+
+        if analysis is None:
+            analysis = json.loads(_extract_json_text("".join(chunks).strip()))
+        _audience_cache_put(cache_path, analysis)
         return analysis
         
     except Exception as e:
@@ -229,49 +411,102 @@ Return ONLY valid JSON, no other text."""
         }
 
 
-def explain_creative_choices(brand_info: dict, context: dict, creative_index: int) -> str:
-    """Generate explanation for creative design choices."""
-    explanation = f"""### 🎨 Creative #{creative_index} - Design Rationale
+async def _generate_all(dalle_service, prompts: list, logo_img=None) -> list:
+    """Fan DALL-E requests out concurrently, bounded to respect rate limits.
+
+    Logo compositing runs in worker threads as each image completes, so
+    the blocking PIL work overlaps with the calls still in flight.
+    """
+    from app.utils.image_utils import create_composite
+
+    semaphore = asyncio.Semaphore(8)
+
+    async def generate_bounded(prompt):
+        async with semaphore:
+            image = await dalle_service.generate_image_async(prompt)
+        if image is not None and logo_img is not None:
+            image = await asyncio.to_thread(create_composite, image, logo_img)
+        return image
+
+    return await asyncio.gather(
+        *(generate_bounded(prompt) for prompt in prompts),
+        return_exceptions=True
+    )
+
+
+async def _generate_assets(
+    dalle_service,
+    caption_generator,
+    prompts: list,
+    brand_info: dict,
+    context_variations: list,
+    tone: str,
+    logo_img=None
+) -> tuple:
+    """Run the image and caption fan-outs concurrently.
+
+    Both stages are network-bound, so overlapping them cuts roughly the
+    whole caption-stage duration off the end-to-end time.
+    """
+    images, captions = await asyncio.gather(
+        _generate_all(dalle_service, prompts, logo_img),
+        caption_generator.generate_multiple_captions_async(
+            brand_info, context_variations, tone
+        )
+    )
+    return images, captions
+
+
+# Explanation Markdown templates hoisted to module scope: the display
+# grid re-renders these for every creative on every rerun, so each call
+# is one format_map over a flat dict instead of ~20 .get() chains.
+_EXPLAIN_TMPL = """### 🎨 Creative #{creative_index} - Design Rationale
 
 **Color Palette:**
-- Primary Brand Color: {brand_info.get('brand_palette', {}).get('primary_hex', '#667eea')}
-- Color Scheme: {', '.join(brand_info.get('brand_palette', {}).get('hex_colors', [])[:3])}
+- Primary Brand Color: {primary_hex}
+- Color Scheme: {color_scheme}
 - Reasoning: Colors extracted from your brand logo to maintain consistency and recognition.
 
 **Positioning & Layout:**
 - Logo Placement: Top-right corner for brand visibility without overwhelming the creative
 - Composition: Professional ad layout optimized for social media engagement
-- Style: {context.get('mood', 'Engaging and contextual')}
+- Style: {mood}
 
 **Context Integration:**
-- Location: {context.get('city', 'Target city')}
-- Weather: {context.get('weather', {}).get('description', 'Current conditions')} at {context.get('weather', {}).get('temperature', 'N/A')}°C
-- Time: {context.get('time_of_day', 'Day')} during {context.get('season', 'season')}
-- Theme: {context.get('theme', 'Lifestyle-focused')}
+- Location: {city}
+- Weather: {weather_description} at {weather_temperature}°C
+- Time: {time_of_day} during {season}
+- Theme: {theme}
 
 **Why This Works:**
-- Contextually relevant to {context.get('city', 'the target location')}'s current conditions
-- Aligns with {context.get('local_vibes', 'local culture and preferences')}
-- Optimized for {context.get('mood', 'target audience engagement')}
+- Contextually relevant to {city}'s current conditions
+- Aligns with {local_vibes}
+- Optimized for {mood}
 - Brand colors ensure immediate recognition
 
 **Suggested Use Cases:**
 - Social media posts (Instagram, Facebook)
 - Digital advertising campaigns
 - Location-specific promotions
-- {context.get('season', 'Seasonal')} campaigns
+- {season} campaigns
 """
-    return explanation
 
+_EXPLAIN_DEFAULTS = {
+    "primary_hex": "#667eea",
+    "color_scheme": "",
+    "mood": "Engaging and contextual",
+    "city": "Target city",
+    "weather_description": "Current conditions",
+    "weather_temperature": "N/A",
+    "time_of_day": "Day",
+    "season": "season",
+    "theme": "Lifestyle-focused",
+    "local_vibes": "local culture and preferences",
+}
 
-def get_refinement_suggestions(selected_indices: list, brand_info: dict) -> str:
-    """Generate suggestions for refining selected creatives."""
-    if not selected_indices:
-        return "Please select creatives to refine."
-    
-    suggestions = f"""### 🎯 Refinement Suggestions for Selected Creatives
+_REFINE_TMPL = """### 🎯 Refinement Suggestions for Selected Creatives
 
-You've selected {len(selected_indices)} creative(s) for refinement.
+You've selected {num_selected} creative(s) for refinement.
 
 **Possible Refinements:**
 
@@ -300,13 +535,41 @@ You've selected {len(selected_indices)} creative(s) for refinement.
 2. Generate new variations with adjusted parameters
 3. A/B test different versions with your audience
 
-**Pro Tip:** The selected creatives show strong {brand_info.get('product_category', 'product')} appeal. Consider testing them in different regions to see which performs best!
+**Pro Tip:** The selected creatives show strong {product_category} appeal. Consider testing them in different regions to see which performs best!
 """
-    return suggestions
+
+
+def explain_creative_choices(brand_info: dict, context: dict, creative_index: int) -> str:
+    """Generate explanation for creative design choices."""
+    palette = brand_info.get('brand_palette', {})
+    weather = context.get('weather', {})
+    # Flatten the nested dicts once; ChainMap fills any missing slot
+    # from the defaults without per-key .get(..., default) calls
+    flat = {
+        "creative_index": creative_index,
+        "color_scheme": ', '.join(palette.get('hex_colors', [])[:3]),
+        **{k: v for k, v in palette.items() if k == "primary_hex"},
+        **{f"weather_{k}": v for k, v in weather.items() if k in ("description", "temperature")},
+        **{k: v for k, v in context.items() if k in _EXPLAIN_DEFAULTS},
+    }
+    return _EXPLAIN_TMPL.format_map(ChainMap(flat, _EXPLAIN_DEFAULTS))
+
+
+def get_refinement_suggestions(selected_indices: list, brand_info: dict) -> str:
+    """Generate suggestions for refining selected creatives."""
+    if not selected_indices:
+        return "Please select creatives to refine."
+
+    return _REFINE_TMPL.format_map({
+        "num_selected": len(selected_indices),
+        "product_category": brand_info.get('product_category', 'product'),
+    })
 
 def main():
     """Main application function."""
-    
+
+    st.markdown(_css(), unsafe_allow_html=True)
+
     # Header
     st.markdown("""
     <div class="header-container">
@@ -366,18 +629,18 @@ def main():
         st.markdown("### 📍 Location Targeting")
         
         # Hierarchical location selection
-        country = st.selectbox("🌍 Select Country", list(LOCATION_DATA.keys()), index=0)
-        
-        regions = list(LOCATION_DATA[country].keys())
-        region = st.selectbox("🗺️ Select Region", regions, index=0)
-        
+        country = st.selectbox("🌍 Select Country", COUNTRIES, index=0)
+
+        region = st.selectbox("🗺️ Select Region", REGIONS_BY_COUNTRY[country], index=0)
+
         cities = LOCATION_DATA[country][region]
-        
+
         # If we have audience insights, highlight recommended cities
         if st.session_state.audience_insights and 'recommended_cities' in st.session_state.audience_insights:
             recommended = st.session_state.audience_insights['recommended_cities']
             # Filter recommended cities that are in the selected region
-            available_recommended = [c for c in recommended if c in cities]
+            city_set = CITY_SETS[(country, region)]
+            available_recommended = [c for c in recommended if c in city_set]
             if available_recommended:
                 st.info(f"💡 AI recommends: {', '.join(available_recommended)}")
         
@@ -427,7 +690,7 @@ def main():
         )
         
         if logo_file:
-            logo_image = Image.open(logo_file)
+            logo_image = _decoded_upload(logo_file, "logo_image")
             st.image(logo_image, caption="Brand Logo", use_column_width=True)
     
     with col2:
@@ -439,7 +702,7 @@ def main():
         )
         
         if product_file:
-            product_image = Image.open(product_file)
+            product_image = _decoded_upload(product_file, "product_image")
             st.image(product_image, caption="Product Image", use_column_width=True)
     
     # Generate button
@@ -459,47 +722,37 @@ def main():
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("### 🎬 Generating Your Creatives...")
         
-        # Progress tracking
+        # Progress tracking; updates are coalesced so fast back-to-back
+        # steps don't each cost a WebSocket frame to the browser
         progress_bar = st.progress(0)
         status_text = st.empty()
-        
+        progress = _ProgressReporter(progress_bar, status_text)
+
         try:
             # Step 1: Initialize services
-            status_text.text("🔧 Initializing AI services...")
-            progress_bar.progress(10)
-            
-            context_engine = ContextEngine()
-            brand_extractor = BrandExtractor()
-            prompt_builder = PromptBuilder()
-            caption_generator = CaptionGenerator()
-            dalle_service = DalleService()
-            
-            time.sleep(0.5)
-            
+            progress.update(10, "🔧 Initializing AI services...", force=True)
+
+            from app.utils.image_utils import save_png_fast
+            from app.utils.zip_utils import create_creative_package
+
+            context_engine, prompt_builder, caption_generator, dalle_service = _get_services()
+
             # Step 2: Extract brand information
-            status_text.text("🎨 Analyzing brand identity...")
-            progress_bar.progress(20)
-            
-            logo_img = Image.open(logo_file) if logo_file else None
-            product_img = Image.open(product_file) if product_file else None
-            
-            brand_info = brand_extractor.extract_brand_info(
-                logo_image=logo_img,
-                product_image=product_img,
-                brand_name=brand_name,
-                product_category=product_category
+            progress.update(20, "🎨 Analyzing brand identity...")
+
+            logo_img = _decoded_upload(logo_file, "logo_image") if logo_file else None
+
+            brand_info = _cached_brand_info(
+                logo_file.getvalue() if logo_file else None,
+                product_file.getvalue() if product_file else None,
+                brand_name,
+                product_category
             )
             
-            time.sleep(0.5)
-            
             # Step 3: Get context
-            status_text.text(f"🌍 Gathering context for {city}...")
-            progress_bar.progress(30)
-            
-            base_context = context_engine.get_context(
-                city=city,
-                product_category=product_category
-            )
+            progress.update(30, f"🌍 Gathering context for {city}...")
+
+            base_context = _cached_context(city, product_category)
             
             # Create variations
             context_variations = context_engine.create_context_variations(
@@ -507,63 +760,56 @@ def main():
                 num_variations=num_creatives
             )
             
-            time.sleep(0.5)
-            
             # Step 4: Build prompts
-            status_text.text("📝 Creating AI prompts...")
-            progress_bar.progress(40)
-            
+            progress.update(40, "📝 Creating AI prompts...")
+
             prompts = prompt_builder.build_multiple_prompts(
                 brand_info=brand_info,
                 context_variations=context_variations
             )
             
-            time.sleep(0.5)
-            
-            # Step 5: Generate images
-            status_text.text("🎨 Generating images with DALL-E...")
-            progress_bar.progress(50)
-            
-            generated_images = []
-            for idx, prompt in enumerate(prompts):
-                progress = 50 + int((idx / len(prompts)) * 30)
-                progress_bar.progress(progress)
-                status_text.text(f"🎨 Generating image {idx + 1}/{len(prompts)}...")
-                
-                image = dalle_service.generate_image(prompt)
-                if image:
-                    # Add logo if provided
-                    if logo_img:
-                        image = create_composite(image, logo_img)
-                    generated_images.append(image)
-            
-            # Step 6: Generate captions
-            status_text.text("💬 Creating engaging captions...")
-            progress_bar.progress(85)
-            
-            captions = caption_generator.generate_multiple_captions(
-                brand_info=brand_info,
-                context_variations=context_variations,
-                tone=caption_tone.lower()
+            # Step 5: Generate images and captions — both network-bound
+            # fan-outs, run concurrently in one event loop
+            progress.update(
+                50,
+                f"🎨 Generating {len(prompts)} images and captions concurrently...",
+                force=True
             )
-            
-            time.sleep(0.5)
-            
+            results, captions = asyncio.run(_generate_assets(
+                dalle_service,
+                caption_generator,
+                prompts,
+                brand_info,
+                context_variations,
+                caption_tone.lower(),
+                logo_img
+            ))
+
+            generated_images = [
+                result for result in results
+                if not isinstance(result, Exception) and result is not None
+            ]
+            progress.update(85)
+
             # Step 7: Save and package
-            status_text.text("📦 Packaging your creatives...")
-            progress_bar.progress(95)
-            
+            progress.update(95, "📦 Packaging your creatives...")
+
             # Create output directory
             output_dir = "output"
             os.makedirs(output_dir, exist_ok=True)
             
-            # Save images
-            image_paths = []
-            for idx, img in enumerate(generated_images):
-                img_path = os.path.join(output_dir, f"creative_{idx+1:02d}.png")
-                img = ensure_rgb(img)
-                img.save(img_path)
-                image_paths.append(img_path)
+            # Save images; PIL releases the GIL during PNG encode, so
+            # the writes scale across threads
+            image_paths = [
+                os.path.join(output_dir, f"creative_{idx+1:02d}.png")
+                for idx in range(len(generated_images))
+            ]
+            # Encode display copies in the same pool: the grid feeds
+            # st.image pre-encoded bytes instead of re-encoding the PIL
+            # images on every rerun
+            with ThreadPoolExecutor(max_workers=min(8, len(generated_images) or 1)) as executor:
+                list(executor.map(save_png_fast, generated_images, image_paths))
+                creative_pngs = list(executor.map(_encode_png, generated_images))
             
             # Create metadata
             metadata = [
@@ -585,15 +831,13 @@ def main():
             
             # Store in session state (including context for explanations)
             st.session_state.generated_creatives = generated_images
+            st.session_state.creative_pngs = creative_pngs
             st.session_state.generated_captions = captions
             st.session_state.zip_path = zip_path
             st.session_state.context_variations = context_variations
             st.session_state.brand_info = brand_info
             
-            progress_bar.progress(100)
-            status_text.text("✅ Generation complete!")
-            
-            time.sleep(0.5)
+            progress.update(100, "✅ Generation complete!", force=True)
             
             # Success message
             st.markdown(f"""
@@ -611,15 +855,24 @@ def main():
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("### 🎨 Your Generated Creatives")
         
-        # Download button
-        if st.session_state.zip_path and os.path.exists(st.session_state.zip_path):
-            with open(st.session_state.zip_path, "rb") as f:
-                st.download_button(
-                    label="📥 Download All Creatives (ZIP)",
-                    data=f,
-                    file_name=os.path.basename(st.session_state.zip_path),
-                    mime="application/zip"
-                )
+        # Download button: read the archive once per package and hand
+        # Streamlit the cached bytes, instead of re-buffering the file
+        # object on every widget-triggered rerun
+        zip_path = st.session_state.zip_path
+        if zip_path and os.path.exists(zip_path):
+            # Keyed on mtime as well: regenerating reuses the same
+            # package name but produces a new archive
+            zip_key = (zip_path, os.path.getmtime(zip_path))
+            if st.session_state.get("zip_bytes_key") != zip_key:
+                with open(zip_path, "rb") as f:
+                    st.session_state.zip_bytes = f.read()
+                st.session_state.zip_bytes_key = zip_key
+            st.download_button(
+                label="📥 Download All Creatives (ZIP)",
+                data=st.session_state.zip_bytes,
+                file_name=os.path.basename(zip_path),
+                mime="application/zip"
+            )
         
         st.markdown("<br>", unsafe_allow_html=True)
         
@@ -659,7 +912,7 @@ def main():
                             st.markdown("⭐ **SELECTED**")
                         
                         st.image(
-                            st.session_state.generated_creatives[idx],
+                            st.session_state.creative_pngs[idx],
                             caption=f"Creative {idx + 1}",
                             use_column_width=True
                         )